@@ -1,11 +1,14 @@
 """Base class for specialized documentation agents."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Generic, TypeVar
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
-from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel
 
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
 from omni_doc.config import get_settings
 from omni_doc.models.state import OmniDocState
 from omni_doc.utils.logging import get_logger, LLMError
@@ -31,14 +34,22 @@ class BaseDocAgent(ABC, Generic[T]):
     - process(): Main processing logic
     """
 
-    def __init__(self, temperature: float = 0.2) -> None:
+    def __init__(
+        self,
+        temperature: float = 0.2,
+        llm_factory: "Callable[[], ChatGoogleGenerativeAI] | None" = None,
+    ) -> None:
         """Initialize the agent.
 
         Args:
             temperature: LLM temperature (0.0-1.0). Higher = more creative.
+            llm_factory: Optional callable that builds the LLM. Defaults to
+                constructing ChatGoogleGenerativeAI from settings; tests can
+                inject a stub here instead of patching the class.
         """
         self._temperature = temperature
-        self._llm: ChatGoogleGenerativeAI | None = None
+        self._llm_factory = llm_factory
+        self._llm: "ChatGoogleGenerativeAI | None" = None
 
     @property
     @abstractmethod
@@ -58,15 +69,25 @@ class BaseDocAgent(ABC, Generic[T]):
         """Pydantic model class for structured output."""
         ...
 
-    def _get_llm(self) -> ChatGoogleGenerativeAI:
-        """Get or create the LLM instance."""
+    def _get_llm(self) -> "ChatGoogleGenerativeAI":
+        """Get or create the LLM instance.
+
+        langchain_google_genai is imported here, not at module top: agents
+        (and tests) that never touch the LLM - name/prompt properties,
+        injected-factory stubs - skip its multi-hundred-ms import cost.
+        """
         if self._llm is None:
-            settings = get_settings()
-            self._llm = ChatGoogleGenerativeAI(
-                model=settings.gemini_model,
-                google_api_key=settings.google_api_key.get_secret_value(),
-                temperature=self._temperature,
-            )
+            if self._llm_factory is not None:
+                self._llm = self._llm_factory()
+            else:
+                from langchain_google_genai import ChatGoogleGenerativeAI
+
+                settings = get_settings()
+                self._llm = ChatGoogleGenerativeAI(
+                    model=settings.gemini_model,
+                    google_api_key=settings.google_api_key.get_secret_value(),
+                    temperature=self._temperature,
+                )
         return self._llm
 
     async def _invoke(self, user_prompt: str) -> T:
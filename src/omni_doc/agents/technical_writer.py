@@ -1,6 +1,7 @@
 """Technical Writer Agent for creating new documentation."""
 
 import uuid
+from collections.abc import Callable
 from typing import Any
 
 from omni_doc.agents.base import BaseDocAgent
@@ -101,13 +102,16 @@ MIN_COMPREHENSIVE_DOC_LENGTH = 4000  # ~800-1000 words
 class TechnicalWriterAgent(BaseDocAgent[TechnicalWriterOutput]):
     """Agent that creates documentation for undocumented code."""
 
-    def __init__(self, temperature: float = 0.3) -> None:
+    def __init__(
+        self, temperature: float = 0.3, llm_factory: Callable[[], Any] | None = None
+    ) -> None:
         """Initialize the technical writer agent.
 
         Args:
             temperature: LLM temperature
+            llm_factory: Optional LLM builder, forwarded to BaseDocAgent
         """
-        super().__init__(temperature=temperature)
+        super().__init__(temperature=temperature, llm_factory=llm_factory)
         self._comprehensive_mode = False
         self._base_temperature = temperature
 
@@ -1,6 +1,7 @@
 """Visual Architect Agent for generating Mermaid diagrams."""
 
 import uuid
+from collections.abc import Callable
 from typing import Any
 
 from omni_doc.agents.base import BaseDocAgent
@@ -193,9 +194,9 @@ VISUAL_ARCHITECT_PROMPT = VISUAL_ARCHITECT_PROMPT_INCREMENTAL
 class VisualArchitectAgent(BaseDocAgent[DiagramOutput]):
     """Agent that creates Mermaid diagrams for complex flows."""
 
-    def __init__(self) -> None:
+    def __init__(self, llm_factory: Callable[[], Any] | None = None) -> None:
         """Initialize with moderate temperature."""
-        super().__init__(temperature=0.3)
+        super().__init__(temperature=0.3, llm_factory=llm_factory)
         self._comprehensive_mode = False
 
     @property
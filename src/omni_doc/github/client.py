@@ -19,6 +19,9 @@ logger = get_logger(__name__)
 # GitHub API base URL
 GITHUB_API_BASE = "https://api.github.com"
 
+# PR URL pattern, compiled once at import instead of per parse call
+_PR_URL_RE = re.compile(r"https?://github\.com/([^/]+)/([^/]+)/pull/(\d+)")
+
 
 class GitHubClient:
     """GitHub API client using httpx.
@@ -71,8 +74,7 @@ class GitHubClient:
         Raises:
             GitHubAPIError: If URL format is invalid
         """
-        pattern = r"https?://github\.com/([^/]+)/([^/]+)/pull/(\d+)"
-        match = re.match(pattern, url)
+        match = _PR_URL_RE.match(url)
         if not match:
             raise GitHubAPIError(f"Invalid GitHub PR URL format: {url}")
         return match.group(1), match.group(2), int(match.group(3))
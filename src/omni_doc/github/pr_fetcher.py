@@ -1,5 +1,6 @@
 """PR Fetcher for extracting PR diff and metadata."""
 
+from collections.abc import AsyncIterator
 from typing import Optional
 
 from omni_doc.github.client import GitHubClient, get_github_client
@@ -121,21 +122,24 @@ class PRFetcher:
                 return None
             raise
 
-    async def get_repo_tree(
+    async def iter_repo_tree(
         self,
         owner: str,
         repo: str,
         ref: Optional[str] = None,
-    ) -> list[str]:
-        """Get list of all file paths in repository.
+    ) -> AsyncIterator[str]:
+        """Stream all file paths in the repository.
+
+        Yields paths one at a time so callers that classify files as they
+        go never hold the full path list in memory.
 
         Args:
             owner: Repository owner
             repo: Repository name
             ref: Git ref (optional)
 
-        Returns:
-            List of file paths
+        Yields:
+            File paths
 
         Raises:
             GitHubAPIError: If fetch fails
@@ -145,21 +149,42 @@ class PRFetcher:
         try:
             logger.info(f"Fetching repo tree: {owner}/{repo}")
             tree = await client.get_repo_tree(owner, repo, ref)
-
-            # Filter to only blob (file) entries
-            file_paths = [
-                entry["path"]
-                for entry in tree["entries"]
-                if entry["type"] == "blob"
-            ]
-
-            logger.info(f"Found {len(file_paths)} files in repository")
-            return file_paths
-
         except Exception as e:
             logger.error(f"Failed to fetch repo tree: {e}")
             raise GitHubAPIError(f"Failed to fetch repo tree: {e}") from e
 
+        # Yield only blob (file) entries
+        file_count = 0
+        for entry in tree["entries"]:
+            if entry["type"] == "blob":
+                file_count += 1
+                yield entry["path"]
+
+        logger.info(f"Found {file_count} files in repository")
+
+    async def get_repo_tree(
+        self,
+        owner: str,
+        repo: str,
+        ref: Optional[str] = None,
+    ) -> list[str]:
+        """Get list of all file paths in repository.
+
+        Adaptor over iter_repo_tree for callers that need the full list.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Git ref (optional)
+
+        Returns:
+            List of file paths
+
+        Raises:
+            GitHubAPIError: If fetch fails
+        """
+        return [path async for path in self.iter_repo_tree(owner, repo, ref)]
+
 
 # Global fetcher instance
 _pr_fetcher: Optional[PRFetcher] = None
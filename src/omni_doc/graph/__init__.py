@@ -1,5 +1,20 @@
 """LangGraph workflow assembly for Omni-Doc."""
 
-from omni_doc.graph.main_graph import build_main_graph, run_analysis
+from typing import Any
+
+from omni_doc.graph.runner import run_analysis
 
 __all__ = ["build_main_graph", "run_analysis"]
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily expose build_main_graph.
+
+    main_graph imports langgraph and every node module; deferring it keeps
+    'from omni_doc.graph import run_analysis' (the CLI path) lightweight.
+    """
+    if name == "build_main_graph":
+        from omni_doc.graph.main_graph import build_main_graph
+
+        return build_main_graph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -151,40 +151,3 @@ def build_main_graph() -> StateGraph:
     logger.info("Workflow graph compiled successfully")
 
     return compiled
-
-
-async def run_analysis(
-    pr_url: str,
-    dry_run: bool = False,
-    enable_diagrams: bool = True,
-) -> dict:
-    """Run the full Omni-Doc analysis workflow.
-
-    Args:
-        pr_url: GitHub PR URL to analyze
-        dry_run: If True, don't post comment to GitHub
-        enable_diagrams: If True, generate Mermaid diagrams
-
-    Returns:
-        Final workflow state
-    """
-    from omni_doc.models.state import create_initial_state
-
-    logger.info(f"Starting analysis for: {pr_url}")
-    logger.info(f"Options: dry_run={dry_run}, diagrams={enable_diagrams}")
-
-    # Build the graph
-    graph = build_main_graph()
-
-    # Create initial state
-    initial_state = create_initial_state(
-        pr_url=pr_url,
-        dry_run=dry_run,
-        enable_diagrams=enable_diagrams,
-    )
-
-    # Run the graph
-    final_state = await graph.ainvoke(initial_state)
-
-    logger.info("Analysis complete")
-    return final_state
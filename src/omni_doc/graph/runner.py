@@ -0,0 +1,50 @@
+"""Entry point for running the Omni-Doc analysis workflow.
+
+Kept separate from main_graph so importing run_analysis does not pull in
+langgraph, every node module and their transitive LLM dependencies; that
+import graph is only paid when an analysis actually runs.
+"""
+
+from omni_doc.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+async def run_analysis(
+    pr_url: str,
+    dry_run: bool = False,
+    enable_diagrams: bool = True,
+) -> dict:
+    """Run the full Omni-Doc analysis workflow.
+
+    Args:
+        pr_url: GitHub PR URL to analyze
+        dry_run: If True, don't post comment to GitHub
+        enable_diagrams: If True, generate Mermaid diagrams
+
+    Returns:
+        Final workflow state
+    """
+    # Imported here so the graph (and its node modules) only load when an
+    # analysis is actually run
+    from omni_doc.graph.main_graph import build_main_graph
+    from omni_doc.models.state import create_initial_state
+
+    logger.info(f"Starting analysis for: {pr_url}")
+    logger.info(f"Options: dry_run={dry_run}, diagrams={enable_diagrams}")
+
+    # Build the graph
+    graph = build_main_graph()
+
+    # Create initial state
+    initial_state = create_initial_state(
+        pr_url=pr_url,
+        dry_run=dry_run,
+        enable_diagrams=enable_diagrams,
+    )
+
+    # Run the graph
+    final_state = await graph.ainvoke(initial_state)
+
+    logger.info("Analysis complete")
+    return final_state
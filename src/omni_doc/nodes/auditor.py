@@ -3,7 +3,6 @@
 import uuid
 from typing import Optional
 
-from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
 
 from omni_doc.config import get_settings
@@ -154,7 +153,10 @@ async def analyze_changes(state: OmniDocState) -> dict:
             validation_feedback=validation_feedback,
         )
 
-        # Initialize LLM
+        # Initialize LLM; deferred import keeps the heavy
+        # langchain/google client out of module import time
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         settings = get_settings()
         llm = ChatGoogleGenerativeAI(
             model=settings.gemini_model,
@@ -1,7 +1,5 @@
 """Critic node for validating analysis quality and detecting hallucinations."""
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-
 from omni_doc.config import get_settings
 from omni_doc.models.output_models import CriticResponse
 from omni_doc.models.state import OmniDocState
@@ -92,7 +90,10 @@ async def validate_analysis(state: OmniDocState) -> dict:
         # Prepare context for validation
         context = _prepare_validation_context(state)
 
-        # Initialize LLM
+        # Initialize LLM; deferred import keeps the heavy
+        # langchain/google client out of module import time
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         settings = get_settings()
         llm = ChatGoogleGenerativeAI(
             model=settings.gemini_model,
@@ -1,10 +1,43 @@
 """Discovery node for determining documentation context sources."""
 
+import re
+
 from omni_doc.models.state import OmniDocState
 from omni_doc.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Documentation-related keywords to look for in PR bodies, compiled into one
+# alternation so the body is scanned in a single pass
+_DOC_KEYWORDS = (
+    "documentation",
+    "docs",
+    "readme",
+    "changelog",
+    "api reference",
+    "getting started",
+    "installation",
+    "configuration",
+)
+_DOC_KEYWORDS_RE = re.compile("|".join(map(re.escape, _DOC_KEYWORDS)), re.IGNORECASE)
+
+# Common documentation file patterns, likewise compiled once
+_DOC_FILE_PATTERNS = (
+    "readme",
+    "changelog",
+    "contributing",
+    "license",
+    "authors",
+    "history",
+    "api",
+    "docs/",
+    "documentation/",
+    ".md",
+    ".rst",
+    ".txt",
+)
+_DOC_FILE_RE = re.compile("|".join(map(re.escape, _DOC_FILE_PATTERNS)), re.IGNORECASE)
+
 
 async def discover_documentation(state: OmniDocState) -> dict:
     """Discover documentation sources and context to gather.
@@ -30,30 +63,16 @@ async def discover_documentation(state: OmniDocState) -> dict:
         logger.warning("No PR metadata available for discovery")
         return {}
 
-    logger.info(f"Discovering documentation for PR: {pr_metadata['title']}")
+    logger.info("Discovering documentation for PR: %s", pr_metadata["title"])
 
     # Analyze PR body for documentation hints
     pr_body = pr_metadata.get("body") or ""
 
-    # Look for documentation-related keywords
-    doc_keywords = [
-        "documentation",
-        "docs",
-        "readme",
-        "changelog",
-        "api reference",
-        "getting started",
-        "installation",
-        "configuration",
-    ]
-
-    found_keywords = [
-        kw for kw in doc_keywords
-        if kw.lower() in pr_body.lower()
-    ]
+    # Look for documentation-related keywords (one scan of the body)
+    found_keywords = sorted({m.group(0).lower() for m in _DOC_KEYWORDS_RE.finditer(pr_body)})
 
     if found_keywords:
-        logger.info(f"Found documentation keywords in PR body: {found_keywords}")
+        logger.info("Found documentation keywords in PR body: %s", found_keywords)
 
     # Check file changes for documentation files
     file_changes = state.get("file_changes", [])
@@ -63,7 +82,7 @@ async def discover_documentation(state: OmniDocState) -> dict:
     ]
 
     if doc_files_changed:
-        logger.info(f"Documentation files in PR: {doc_files_changed}")
+        logger.info("Documentation files in PR: %s", doc_files_changed)
 
     # In MVP, we always scan the repository
     # Future: Could return hints about external doc sources here
@@ -79,22 +98,4 @@ def _is_doc_related(filename: str) -> bool:
     Returns:
         True if file appears to be documentation
     """
-    lower = filename.lower()
-
-    # Check for common doc file patterns
-    doc_patterns = [
-        "readme",
-        "changelog",
-        "contributing",
-        "license",
-        "authors",
-        "history",
-        "api",
-        "docs/",
-        "documentation/",
-        ".md",
-        ".rst",
-        ".txt",
-    ]
-
-    return any(pattern in lower for pattern in doc_patterns)
+    return _DOC_FILE_RE.search(filename) is not None
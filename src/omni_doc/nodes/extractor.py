@@ -1,7 +1,7 @@
 """Extractor node for fetching PR diff and metadata."""
 
 from omni_doc.github.client import GitHubClient
-from omni_doc.github.pr_fetcher import PRFetcher
+from omni_doc.github.pr_fetcher import get_pr_fetcher
 from omni_doc.models.state import OmniDocState
 from omni_doc.utils.logging import get_logger, GitHubAPIError
 
@@ -23,15 +23,16 @@ async def extract_pr_diff(state: OmniDocState) -> dict:
         State update with pr_metadata and file_changes
     """
     pr_url = state["pr_url"]
-    logger.info(f"Extracting PR data from: {pr_url}")
+    logger.info("Extracting PR data from: %s", pr_url)
 
     try:
         # Parse PR URL
         owner, repo, pr_number = GitHubClient.parse_pr_url_sync(pr_url)
-        logger.info(f"Parsed PR: {owner}/{repo}#{pr_number}")
+        logger.info("Parsed PR: %s/%s#%s", owner, repo, pr_number)
 
-        # Fetch PR details
-        fetcher = PRFetcher()
+        # Fetch PR details (shared fetcher keeps HTTP connections alive
+        # across nodes)
+        fetcher = await get_pr_fetcher()
         pr_metadata, file_changes = await fetcher.fetch_pr_details(
             owner=owner,
             repo=repo,
@@ -39,7 +40,7 @@ async def extract_pr_diff(state: OmniDocState) -> dict:
         )
 
         logger.info(
-            f"Extracted PR '{pr_metadata['title']}' with {len(file_changes)} file changes"
+            "Extracted PR '%s' with %d file changes", pr_metadata["title"], len(file_changes)
         )
 
         return {
@@ -48,7 +49,7 @@ async def extract_pr_diff(state: OmniDocState) -> dict:
         }
 
     except GitHubAPIError as e:
-        logger.error(f"GitHub API error: {e}")
+        logger.error("GitHub API error: %s", e)
         return {
             "errors": [f"Failed to extract PR data: {e.message}"],
         }
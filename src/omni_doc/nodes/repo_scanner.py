@@ -1,9 +1,15 @@
 """Repo Scanner node for finding documentation files in the repository."""
 
+import asyncio
 import fnmatch
-from typing import Optional
-
-from omni_doc.github.pr_fetcher import PRFetcher
+import re
+import sys
+from functools import lru_cache
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Optional, TypeVar
+
+from omni_doc.github.pr_fetcher import PRFetcher, get_pr_fetcher
 from omni_doc.models.state import DocumentationFile, DocumentationStatus, OmniDocState, SourceFile
 from omni_doc.utils.logging import get_logger, GitHubAPIError
 
@@ -59,6 +65,72 @@ EXCLUDE_PATTERNS = [
     "yarn.lock",
 ]
 
+def _compile_patterns(patterns: list[str]) -> re.Pattern[str]:
+    """Compile a list of glob patterns into a single combined regex.
+
+    Patterns are matched case-insensitively against lowercased paths.
+    Directory patterns (ending in "/*") also match anywhere in the path.
+
+    Args:
+        patterns: List of glob patterns
+
+    Returns:
+        Compiled regex matching any of the patterns
+    """
+    parts = []
+    for pattern in patterns:
+        parts.append(fnmatch.translate(pattern.lower()))
+        if pattern.endswith("/*"):
+            parts.append(f"(?s:.*{re.escape(pattern[:-2].lower())}.*)")
+    return re.compile("|".join(f"(?:{p})" for p in parts))
+
+
+# Compiled once at import so the scan loops do a single C-level regex match
+# per path instead of one fnmatch call per pattern
+_DOC_PATTERNS_RE = _compile_patterns(DOC_PATTERNS)
+_EXCLUDE_PATTERNS_RE = _compile_patterns(EXCLUDE_PATTERNS)
+
+# Combined multi-pattern matcher: one scan classifies a path as excluded or
+# documentation, with exclusion taking precedence (its alternatives come first)
+_CLASSIFY_RE = re.compile(
+    f"(?P<exclude>{_EXCLUDE_PATTERNS_RE.pattern})|(?P<doc>{_DOC_PATTERNS_RE.pattern})"
+)
+
+# Fast-accept prefilters for the common cases in DOC_PATTERNS, so most doc
+# files are recognized with a single C-level endswith/startswith call
+_DOC_EXTENSIONS = (".md", ".markdown", ".rst", ".yaml", ".yml", ".toml", ".json")
+_DOC_FILENAME_PREFIXES = (
+    "readme", "changelog", "changes", "history", "contributing", "authors", "license",
+)
+
+# Common documentation filenames (without extension)
+_DOC_NAMES = frozenset({
+    "readme",
+    "changelog",
+    "changes",
+    "history",
+    "contributing",
+    "authors",
+    "license",
+    "api",
+    "index",
+    "getting-started",
+    "installation",
+    "configuration",
+    "usage",
+    "faq",
+    "troubleshooting",
+})
+
+# Single-pass alternations for the fixed substring needles scanned per path
+_DOC_DIRS_RE = re.compile(r"docs/|doc/|documentation/")
+_SOURCE_SKIP_RE = re.compile(r"test|spec|__pycache__|\.git")
+
+# Interned classification strings so the many state dicts holding them all
+# share a single object per value
+_DOC_TYPES = {t: sys.intern(t) for t in ("readme", "guide", "api", "changelog", "config", "other")}
+_DOC_STATUSES = {s: sys.intern(s) for s in ("missing", "minimal", "present")}
+
 # Maximum file size to fetch content (100KB)
 MAX_CONTENT_SIZE = 100 * 1024
 
@@ -80,9 +152,23 @@ SOURCE_CODE_EXTENSIONS = [
     ".sh", ".bash", ".zsh",
 ]
 
+# Tuple form for single-call str.endswith dispatch
+_SOURCE_EXTENSIONS = tuple(SOURCE_CODE_EXTENSIONS)
+
+# Entry-point filenames fetched before other source files
+_PRIORITY_NAMES = frozenset({
+    "main.py", "app.py", "index.js", "index.ts", "main.go", "main.rs", "main.java", "mod.rs",
+})
+
 # Maximum number of source files to fetch
 MAX_SOURCE_FILES = 20
 
+# Maximum number of concurrent file content fetches (stays below GitHub rate limits)
+MAX_CONCURRENT_FETCHES = 10
+
+# Fetched-file type produced by a _gather_files fetch function
+_FileT = TypeVar("_FileT", DocumentationFile, SourceFile)
+
 
 def _determine_documentation_status(
     documentation_files: list[DocumentationFile],
@@ -103,11 +189,10 @@ def _determine_documentation_status(
 
     for doc_file in documentation_files:
         path_lower = doc_file["path"].lower()
-        content = doc_file.get("content") or ""
-        content_length = len(content.strip())
+        content_length = len((doc_file.get("content") or "").strip())
 
         # Check for README files
-        if "readme" in path_lower.split("/")[-1]:
+        if "readme" in path_lower.rpartition("/")[2]:
             has_readme = True
             readme_content_length = max(readme_content_length, content_length)
             if content_length >= MIN_README_CONTENT_LENGTH:
@@ -117,13 +202,22 @@ def _determine_documentation_status(
         if doc_file.get("doc_type") in ["readme", "guide", "api", "changelog"]:
             total_doc_content_length += content_length
 
+        # Early exit: both thresholds reached, status is already "present"
+        # and remaining files cannot change it
+        if (
+            has_readme
+            and not readme_is_empty
+            and total_doc_content_length >= MIN_DOC_CONTENT_FOR_PRESENT
+        ):
+            break
+
     # Determine overall status
     if not has_readme or readme_is_empty:
-        status = "missing"
+        status = _DOC_STATUSES["missing"]
     elif total_doc_content_length < MIN_DOC_CONTENT_FOR_PRESENT:
-        status = "minimal"
+        status = _DOC_STATUSES["minimal"]
     else:
-        status = "present"
+        status = _DOC_STATUSES["present"]
 
     return DocumentationStatus(
         status=status,
@@ -158,63 +252,57 @@ async def scan_repository(state: OmniDocState) -> dict:
     repo = pr_metadata["repo"]
     base_branch = pr_metadata["base_branch"]
 
-    logger.info(f"Scanning repository: {owner}/{repo} (branch: {base_branch})")
+    logger.info("Scanning repository: %s/%s (branch: %s)", owner, repo, base_branch)
 
     try:
-        fetcher = PRFetcher()
+        # Shared fetcher keeps HTTP connections alive across nodes
+        fetcher = await get_pr_fetcher()
 
-        # Get repository file tree
-        all_files = await fetcher.get_repo_tree(
+        # Stream the repository file tree and classify it in one pass
+        # (doc + source candidates + structure summary)
+        doc_files, priority_sources, other_sources, repo_structure = await _classify_tree(
+            fetcher.iter_repo_tree(owner=owner, repo=repo, ref=base_branch)
+        )
+        logger.info("Found %d documentation files", len(doc_files))
+
+        # Fetch content for documentation files concurrently (bounded to stay
+        # below GitHub rate limits)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        documentation_files: list[DocumentationFile] = await _gather_files(
+            _fetch_doc_file,
+            doc_files[:50],  # Limit to 50 files to avoid rate limits
+            fetcher=fetcher,
             owner=owner,
             repo=repo,
             ref=base_branch,
+            semaphore=semaphore,
         )
 
-        # Filter for documentation files
-        doc_files = _find_documentation_files(all_files)
-        logger.info(f"Found {len(doc_files)} documentation files")
-
-        # Fetch content for documentation files
-        documentation_files: list[DocumentationFile] = []
-        for file_path in doc_files[:50]:  # Limit to 50 files to avoid rate limits
-            doc_file = await _fetch_doc_file(
-                fetcher=fetcher,
-                owner=owner,
-                repo=repo,
-                path=file_path,
-                ref=base_branch,
-            )
-            if doc_file:
-                documentation_files.append(doc_file)
-
-        # Build repo structure summary
-        repo_structure = _build_repo_structure(all_files)
-
         # Determine documentation status
         documentation_status = _determine_documentation_status(documentation_files)
 
-        logger.info(f"Processed {len(documentation_files)} documentation files")
-        logger.info(f"Documentation status: {documentation_status['status']}")
+        logger.info("Processed %d documentation files", len(documentation_files))
+        logger.info("Documentation status: %s", documentation_status["status"])
 
         # If documentation is missing, fetch source code files for comprehensive analysis
         source_files: list[SourceFile] = []
         if documentation_status["status"] == "missing":
             logger.info("Documentation missing - fetching source code for comprehensive analysis")
-            source_file_paths = _find_source_files(all_files)
-            logger.info(f"Found {len(source_file_paths)} source code files")
-
-            for file_path in source_file_paths[:MAX_SOURCE_FILES]:
-                source_file = await _fetch_source_file(
-                    fetcher=fetcher,
-                    owner=owner,
-                    repo=repo,
-                    path=file_path,
-                    ref=base_branch,
-                )
-                if source_file:
-                    source_files.append(source_file)
-
-            logger.info(f"Fetched {len(source_files)} source files for analysis")
+            # Priority files (entry points, package roots) come first
+            source_file_paths = priority_sources + other_sources
+            logger.info("Found %d source code files", len(source_file_paths))
+
+            source_files = await _gather_files(
+                _fetch_source_file,
+                source_file_paths[:MAX_SOURCE_FILES],
+                fetcher=fetcher,
+                owner=owner,
+                repo=repo,
+                ref=base_branch,
+                semaphore=semaphore,
+            )
+
+            logger.info("Fetched %d source files for analysis", len(source_files))
 
         return {
             "documentation_files": documentation_files,
@@ -224,101 +312,199 @@ async def scan_repository(state: OmniDocState) -> dict:
         }
 
     except GitHubAPIError as e:
-        logger.error(f"GitHub API error during scan: {e}")
+        logger.error("GitHub API error during scan: %s", e)
         return {"errors": [f"Failed to scan repository: {e.message}"]}
     except Exception as e:
         logger.exception("Unexpected error scanning repository")
         return {"errors": [f"Unexpected error scanning repository: {str(e)}"]}
 
 
-def _find_documentation_files(all_files: list[str]) -> list[str]:
-    """Filter file list to find documentation files.
+async def _gather_files(
+    fetch_fn: Callable[..., Awaitable[Optional[_FileT]]],
+    paths: list[str],
+    fetcher: PRFetcher,
+    owner: str,
+    repo: str,
+    ref: str,
+    semaphore: asyncio.Semaphore,
+) -> list[_FileT]:
+    """Fetch multiple files concurrently with bounded parallelism.
 
     Args:
-        all_files: List of all file paths in repo
+        fetch_fn: Async fetch function (_fetch_doc_file or _fetch_source_file)
+        paths: File paths to fetch
+        fetcher: PR fetcher instance
+        owner: Repository owner
+        repo: Repository name
+        ref: Git ref
+        semaphore: Semaphore capping concurrent requests
 
     Returns:
-        List of documentation file paths
+        List of successfully fetched files, in input order
     """
-    doc_files = []
 
-    for file_path in all_files:
-        # Skip excluded patterns
-        if _matches_any_pattern(file_path, EXCLUDE_PATTERNS):
-            continue
+    async def _bounded(path: str) -> Optional[_FileT]:
+        async with semaphore:
+            return await fetch_fn(
+                fetcher=fetcher,
+                owner=owner,
+                repo=repo,
+                path=path,
+                ref=ref,
+            )
+
+    results = await asyncio.gather(
+        *(_bounded(path) for path in paths),
+        return_exceptions=True,
+    )
+
+    files: list[_FileT] = []
+    for path, result in zip(paths, results, strict=False):
+        if isinstance(result, BaseException):
+            logger.debug("Failed to fetch %s: %s", path, result)
+        elif result is not None:
+            files.append(result)
+    return files
+
 
-        # Check if it matches documentation patterns
-        if _is_documentation_file(file_path):
+async def _classify_tree(
+    files: AsyncIterator[str],
+) -> tuple[list[str], list[str], list[str], str]:
+    """Classify the repository tree into doc and source files in a single pass.
+
+    Consumes the streamed tree so the full path list is never materialized;
+    each path is lowercased and exclude-checked exactly once, and the repo
+    structure summary is tallied inline.
+
+    Args:
+        files: Streamed file paths from PRFetcher.iter_repo_tree
+
+    Returns:
+        Tuple of (doc_files, priority_source_files, source_files, repo_structure)
+    """
+    doc_files: list[str] = []
+    priority_files: list[str] = []  # Source files that should come first
+    source_files: list[str] = []
+
+    # Repo structure tallies (top-level directories and file counts)
+    file_counts: Counter[str] = Counter()
+    top_dirs: set[str] = set()
+    total_files = 0
+
+    async for file_path in files:
+        total_files += 1
+        top, sep, _ = file_path.partition("/")
+        file_counts[top] += 1
+        if sep:
+            top_dirs.add(top)
+
+        # Lowercase once and share across all classification checks
+        lower_path = file_path.lower()
+
+        # One combined scan handles both the exclude and doc pattern lists.
+        # Doc and source classification are deliberately not exclusive: a
+        # path like lib/index.js or docs/example.py counts as documentation
+        # by name yet must still be a source candidate for the missing-docs
+        # analysis
+        match = _CLASSIFY_RE.match(lower_path)
+        if match is not None:
+            if match.lastgroup == "exclude":
+                continue
             doc_files.append(file_path)
+        elif _is_documentation_file(lower_path):
+            doc_files.append(file_path)
+
+        # Skip test files
+        if _SOURCE_SKIP_RE.search(lower_path):
+            continue
+
+        # Check if it's a source code file
+        if _is_source_code_file(lower_path):
+            # Prioritize entry points and package roots
+            filename = lower_path.rpartition("/")[2]
+            if filename in _PRIORITY_NAMES or filename.startswith("__init__"):
+                priority_files.append(file_path)
+            else:
+                source_files.append(file_path)
 
-    return doc_files
+    repo_structure = _build_repo_structure(file_counts, top_dirs, total_files)
+    return doc_files, priority_files, source_files, repo_structure
 
 
-def _is_documentation_file(path: str) -> bool:
+def _is_documentation_file(lower_path: str) -> bool:
     """Check if a file path is a documentation file.
 
     Args:
-        path: File path
+        lower_path: Lowercased file path
 
     Returns:
         True if file appears to be documentation
     """
-    lower_path = path.lower()
+    # Fast path: accept common doc extensions and filenames before running
+    # the full pattern regex. The filename prefixes only apply at the repo
+    # root, where the README*/CHANGELOG* globs are anchored - a nested
+    # src/readme_generator.py is not documentation
+    fname = lower_path.rpartition("/")[2]
+    if fname.endswith(_DOC_EXTENSIONS):
+        return True
+    if "/" not in lower_path and fname.startswith(_DOC_FILENAME_PREFIXES):
+        return True
 
     # Check explicit doc directories
-    if any(d in lower_path for d in ["docs/", "doc/", "documentation/"]):
+    if _DOC_DIRS_RE.search(lower_path):
         return True
 
     # Check file patterns
-    if _matches_any_pattern(path, DOC_PATTERNS):
+    if _matches_any_pattern(lower_path, _DOC_PATTERNS_RE):
         return True
 
     # Check common documentation filenames
-    filename = path.split("/")[-1].lower()
-    doc_names = [
-        "readme",
-        "changelog",
-        "changes",
-        "history",
-        "contributing",
-        "authors",
-        "license",
-        "api",
-        "index",
-        "getting-started",
-        "installation",
-        "configuration",
-        "usage",
-        "faq",
-        "troubleshooting",
-    ]
-
-    name_without_ext = filename.rsplit(".", 1)[0] if "." in filename else filename
-    return name_without_ext in doc_names
-
-
-def _matches_any_pattern(path: str, patterns: list[str]) -> bool:
-    """Check if path matches any of the given patterns.
+    name_without_ext = fname.rsplit(".", 1)[0] if "." in fname else fname
+    return name_without_ext in _DOC_NAMES
+
+
+def _matches_any_pattern(lower_path: str, patterns_re: re.Pattern[str]) -> bool:
+    """Check if path matches any pattern in a compiled pattern set.
 
     Args:
-        path: File path
-        patterns: List of glob patterns
+        lower_path: Lowercased file path
+        patterns_re: Combined regex from _compile_patterns
 
     Returns:
         True if path matches any pattern
     """
-    for pattern in patterns:
-        if fnmatch.fnmatch(path.lower(), pattern.lower()):
-            return True
-        # Also check if pattern is in the path (for directory patterns)
-        if pattern.endswith("/*") and pattern[:-2].lower() in path.lower():
-            return True
-    return False
+    return patterns_re.match(lower_path) is not None
+
+
+def _content_size(content: str, limit: int) -> int:
+    """Compute the UTF-8 byte size of content for a size-limit check.
+
+    A full encode allocates a throwaway bytes copy of the file, so it is
+    only done when the character count alone cannot settle the comparison:
+    len(content) is a lower bound on the byte size and 4 * len(content) an
+    upper bound.
+
+    Args:
+        content: File content
+        limit: Size limit the caller compares against
+
+    Returns:
+        Byte size (exact when it matters for the limit check, otherwise the
+        character-count lower bound)
+    """
+    chars = len(content)
+    if chars > limit or chars * 4 <= limit:
+        return chars
+    return len(content.encode("utf-8"))
 
 
+@lru_cache(maxsize=4096)
 def _classify_doc_type(path: str) -> str:
     """Classify the type of documentation file.
 
+    Pure function of the path, so results are memoized across the repeated
+    classifications a scan performs.
+
     Args:
         path: File path
 
@@ -329,19 +515,19 @@ def _classify_doc_type(path: str) -> str:
     filename = lower_path.split("/")[-1]
 
     if "readme" in filename:
-        return "readme"
+        return _DOC_TYPES["readme"]
     if "changelog" in filename or "changes" in filename or "history" in filename:
-        return "changelog"
+        return _DOC_TYPES["changelog"]
     if "api" in lower_path or "reference" in lower_path:
-        return "api"
+        return _DOC_TYPES["api"]
     if "contributing" in filename:
-        return "guide"
+        return _DOC_TYPES["guide"]
     if any(ext in filename for ext in [".yaml", ".yml", ".toml", ".json"]):
-        return "config"
+        return _DOC_TYPES["config"]
     if "docs/" in lower_path or "doc/" in lower_path:
-        return "guide"
+        return _DOC_TYPES["guide"]
 
-    return "other"
+    return _DOC_TYPES["other"]
 
 
 async def _fetch_doc_file(
@@ -375,9 +561,9 @@ async def _fetch_doc_file(
             return None
 
         # Skip very large files
-        size = len(content.encode("utf-8"))
+        size = _content_size(content, MAX_CONTENT_SIZE)
         if size > MAX_CONTENT_SIZE:
-            logger.debug(f"Skipping large file: {path} ({size} bytes)")
+            logger.debug("Skipping large file: %s (%d bytes)", path, size)
             return DocumentationFile(
                 path=path,
                 doc_type=_classify_doc_type(path),
@@ -393,109 +579,47 @@ async def _fetch_doc_file(
         )
 
     except Exception as e:
-        logger.debug(f"Failed to fetch {path}: {e}")
+        logger.debug("Failed to fetch %s: %s", path, e)
         return None
 
 
-def _build_repo_structure(all_files: list[str]) -> str:
+def _build_repo_structure(
+    file_counts: Counter[str],
+    top_dirs: set[str],
+    total_files: int,
+) -> str:
     """Build a tree-like summary of repository structure.
 
     Args:
-        all_files: List of all file paths
+        file_counts: Files per top-level path segment
+        top_dirs: Top-level directory names
+        total_files: Total number of files in the tree
 
     Returns:
         String representation of repo structure
     """
-    # Build directory tree
-    dirs: set[str] = set()
-    for path in all_files:
-        parts = path.split("/")
-        for i in range(1, len(parts)):
-            dirs.add("/".join(parts[:i]))
-
-    # Get top-level structure (max 3 levels deep)
-    top_dirs = sorted([d for d in dirs if d.count("/") <= 2])
-
-    # Count files per top-level directory
-    file_counts: dict[str, int] = {}
-    for path in all_files:
-        top = path.split("/")[0]
-        file_counts[top] = file_counts.get(top, 0) + 1
-
-    # Build summary
     lines = ["Repository Structure:", ""]
 
     # Show top-level directories with file counts
-    shown_dirs = set()
-    for d in top_dirs:
-        top = d.split("/")[0]
-        if top not in shown_dirs:
-            count = file_counts.get(top, 0)
-            lines.append(f"  {top}/ ({count} files)")
-            shown_dirs.add(top)
+    lines.extend(f"  {top}/ ({file_counts[top]} files)" for top in sorted(top_dirs))
 
     # Add total
-    lines.append("")
-    lines.append(f"Total: {len(all_files)} files")
+    lines += ["", f"Total: {total_files} files"]
 
     return "\n".join(lines)
 
 
-def _find_source_files(all_files: list[str]) -> list[str]:
-    """Find source code files for comprehensive documentation analysis.
-
-    Prioritizes main entry points and important files.
-
-    Args:
-        all_files: List of all file paths in repo
-
-    Returns:
-        List of source file paths, sorted by importance
-    """
-    source_files = []
-    priority_files = []  # Files that should come first
-
-    for file_path in all_files:
-        # Skip excluded patterns
-        if _matches_any_pattern(file_path, EXCLUDE_PATTERNS):
-            continue
-
-        # Skip test files
-        lower_path = file_path.lower()
-        if any(skip in lower_path for skip in ["test", "spec", "__pycache__", ".git"]):
-            continue
-
-        # Check if it's a source code file
-        if _is_source_code_file(file_path):
-            # Prioritize certain files
-            filename = file_path.split("/")[-1].lower()
-            if filename in ["main.py", "app.py", "index.js", "index.ts", "main.go", "main.rs", "main.java"]:
-                priority_files.append(file_path)
-            elif filename.startswith("__init__") or filename == "mod.rs":
-                priority_files.append(file_path)
-            else:
-                source_files.append(file_path)
-
-    # Return priority files first, then others
-    return priority_files + source_files
-
-
-def _is_source_code_file(path: str) -> bool:
+def _is_source_code_file(lower_path: str) -> bool:
     """Check if a file path is a source code file.
 
     Args:
-        path: File path
+        lower_path: Lowercased file path
 
     Returns:
         True if file appears to be source code
     """
-    lower_path = path.lower()
-
-    for ext in SOURCE_CODE_EXTENSIONS:
-        if lower_path.endswith(ext):
-            return True
-
-    return False
+    # str.endswith dispatches over the tuple in C
+    return lower_path.endswith(_SOURCE_EXTENSIONS)
 
 
 async def _fetch_source_file(
@@ -529,9 +653,9 @@ async def _fetch_source_file(
             return None
 
         # Skip very large files
-        size = len(content.encode("utf-8"))
+        size = _content_size(content, MAX_SOURCE_FILE_SIZE)
         if size > MAX_SOURCE_FILE_SIZE:
-            logger.debug(f"Skipping large source file: {path} ({size} bytes)")
+            logger.debug("Skipping large source file: %s (%d bytes)", path, size)
             return None
 
         return SourceFile(
@@ -541,5 +665,5 @@ async def _fetch_source_file(
         )
 
     except Exception as e:
-        logger.debug(f"Failed to fetch source file {path}: {e}")
+        logger.debug("Failed to fetch source file %s: %s", path, e)
         return None
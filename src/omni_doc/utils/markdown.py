@@ -1,5 +1,6 @@
 """Markdown formatting utilities for Omni-Doc output."""
 
+import io
 from typing import Optional
 
 
@@ -16,24 +17,39 @@ def format_table(headers: list[str], rows: list[list[str]]) -> str:
     if not headers:
         return ""
 
+    # Convert all cells to strings once, then reuse for widths and rendering
+    str_rows = [[str(cell) for cell in row] for row in rows]
+
     # Calculate column widths
     widths = [len(h) for h in headers]
-    for row in rows:
+    for row in str_rows:
         for i, cell in enumerate(row):
             if i < len(widths):
-                widths[i] = max(widths[i], len(str(cell)))
-
-    # Build header row
-    header_row = "| " + " | ".join(h.ljust(widths[i]) for i, h in enumerate(headers)) + " |"
-    separator = "| " + " | ".join("-" * w for w in widths) + " |"
-
-    # Build data rows
-    data_rows = []
-    for row in rows:
-        padded = [str(cell).ljust(widths[i]) if i < len(widths) else str(cell) for i, cell in enumerate(row)]
-        data_rows.append("| " + " | ".join(padded) + " |")
-
-    return "\n".join([header_row, separator] + data_rows)
+                widths[i] = max(widths[i], len(cell))
+
+    # Render into a single growable buffer instead of accumulating per-row
+    # strings and joining at the end
+    buf = io.StringIO()
+    sep = " | "
+
+    # Header row and separator
+    buf.write("| ")
+    buf.write(sep.join(h.ljust(w) for h, w in zip(headers, widths, strict=False)))
+    buf.write(" |\n| ")
+    buf.write(sep.join("-" * w for w in widths))
+    buf.write(" |")
+
+    # Data rows
+    for row in str_rows:
+        padded = (
+            cell.ljust(widths[i]) if i < len(widths) else cell
+            for i, cell in enumerate(row)
+        )
+        buf.write("\n| ")
+        buf.write(sep.join(padded))
+        buf.write(" |")
+
+    return buf.getvalue()
 
 
 def format_code_block(code: str, language: str = "") -> str:
@@ -1,6 +1,7 @@
 """Mermaid diagram validation and sanitization utilities."""
 
 import re
+from functools import cache, lru_cache
 from typing import Optional, Tuple
 
 from omni_doc.utils.logging import get_logger
@@ -8,31 +9,147 @@ from omni_doc.utils.logging import get_logger
 logger = get_logger(__name__)
 
 # Characters that cause issues in Mermaid labels
-PROBLEMATIC_IN_EDGE_LABELS = ['(', ')', '[', ']', '{', '}', '<', '>', '"', '#', ';', '|']
-PROBLEMATIC_IN_NODE_LABELS = ['(', ')', '&', '#', '<', '>']
+PROBLEMATIC_IN_EDGE_LABELS = frozenset('()[]{}<>"#;|')
+PROBLEMATIC_IN_NODE_LABELS = frozenset('()&#<>')
 
-# Common Mermaid syntax patterns
-FLOWCHART_PATTERN = re.compile(r'^(flowchart|graph)\s+(TD|TB|BT|RL|LR)', re.MULTILINE)
-SEQUENCE_PATTERN = re.compile(r'^sequenceDiagram', re.MULTILINE)
-CLASS_PATTERN = re.compile(r'^classDiagram', re.MULTILINE)
-STATE_PATTERN = re.compile(r'^stateDiagram', re.MULTILINE)
+# | is the label delimiter itself, already consumed by EDGE_LABEL_PATTERN
+_PROBLEMATIC_EDGE_CHARS = PROBLEMATIC_IN_EDGE_LABELS - {'|'}
 
+# Common Mermaid syntax patterns, compiled lazily: CLI entry points import
+# this module transitively without ever validating a diagram, so the compile
+# cost is deferred to first use (and paid at most once via functools.cache)
+@cache
+def _flowchart_re() -> re.Pattern[str]:
+    return re.compile(r'^(flowchart|graph)\s+(TD|TB|BT|RL|LR)', re.MULTILINE)
+
+
+@cache
+def _sequence_re() -> re.Pattern[str]:
+    return re.compile(r'^sequenceDiagram', re.MULTILINE)
+
+
+@cache
+def _class_re() -> re.Pattern[str]:
+    return re.compile(r'^classDiagram', re.MULTILINE)
+
+
+@cache
+def _state_re() -> re.Pattern[str]:
+    return re.compile(r'^stateDiagram', re.MULTILINE)
+
+
+@cache
+def _diagram_type_re() -> re.Pattern[str]:
+    """Fallback when the first token is not a known keyword (e.g. the diagram
+    starts with a comment): all four type checks in one alternation, so the
+    code is scanned once instead of up to four times."""
+    return re.compile(
+        r'^(?:(?:flowchart|graph)\s+(?:TD|TB|BT|RL|LR)|sequenceDiagram|classDiagram|stateDiagram)',
+        re.MULTILINE,
+    )
+
+
+# First-token dispatch: when the diagram starts with a known keyword, only
+# the matching type pattern needs to run
+_DIAGRAM_TYPE_BY_KEYWORD = {
+    "flowchart": _flowchart_re,
+    "graph": _flowchart_re,
+    "sequenceDiagram": _sequence_re,
+    "classDiagram": _class_re,
+    "stateDiagram": _state_re,
+}
+
+# A bare (unfenced) diagram: optional leading whitespace then a type keyword
+_DIAGRAM_START_RE = re.compile(r'\s*(?:flowchart|graph|sequenceDiagram|classDiagram|stateDiagram)')
+
+# The label patterns below are written to run in linear time under the
+# stdlib backtracking engine (no overlapping alternatives, closer-excluding
+# character classes), so no alternative regex engine is needed.
 # Edge label pattern: matches -->|label|, ---|label|, -.->|label|, ==>|label|, etc.
-# Captures the edge operator, the label, and what follows
+# Captures the edge operator, the label, and what follows.
+# Operator alternatives are ordered longest-first so no alternative is a
+# prefix of a later one - keeps matching deterministic with no backtracking
+# between overlapping branches (e.g. "-->" vs "->").
 EDGE_LABEL_PATTERN = re.compile(
-    r'(--?>|---|-\.->|==?>|~~>|--o|--x|<-->|<-\.->|<==?>)'  # Edge operators
+    r'(<-\.->|<-->|<==>|<=>|-\.->|-->|---|--o|--x|==>|=>|~~>|->)'  # Edge operators
     r'\|([^|]*)\|'  # Label between pipes
 )
 
-# Node definition patterns - captures node ID and label
+# Node bracket shapes: each opener with its one legal closer. The pattern
+# below and the post-match dispatch in _check_node_labels are both generated
+# from this table so the pairs cannot drift apart.
+_NODE_BRACKET_PAIRS = (
+    ('[[', ']]'),  # subroutine
+    ('((', '))'),  # circle
+    ('[(', ')]'),  # cylinder
+    ('[/', '/]'),  # parallelogram
+    ('>[', ']'),   # asymmetric (with bracket)
+    ('>', ']'),    # asymmetric
+    ('[', ']'),    # rectangle
+    ('(', ')'),    # rounded
+    ('{', '}'),    # diamond
+)
+_CLOSER_FOR_OPENER = dict(_NODE_BRACKET_PAIRS)
+
+# Node definition pattern - captures node ID, opener, label and closer
 # Matches: A[label], A(label), A{label}, A((label)), A>label], A[/label/], etc.
+# Opening/closing alternatives are ordered longest-first ("[[" before "[") so
+# two-character brackets are matched as such instead of being shadowed by
+# their one-character prefixes; the label class excludes every closer, so the
+# greedy quantifier cannot overrun a closing bracket.
+_OPENER_ALTERNATION = '|'.join(
+    re.escape(opener)
+    for opener in sorted({p[0] for p in _NODE_BRACKET_PAIRS}, key=lambda s: (-len(s), s))
+)
+_CLOSER_ALTERNATION = '|'.join(
+    re.escape(closer)
+    for closer in sorted({p[1] for p in _NODE_BRACKET_PAIRS}, key=lambda s: (-len(s), s))
+)
 NODE_LABEL_PATTERN = re.compile(
     r'(\b[A-Za-z_][A-Za-z0-9_]*)\s*'  # Node ID
-    r'(\[|\(|\{|\[\[|\(\(|\[\(|\[/|>\[?)'  # Opening bracket
-    r'([^\]\)\}]+?)'  # Label content (non-greedy)
-    r'(\]|\)|\}|\]\]|\)\)|\)\]|/\]|\])'  # Closing bracket
+    f'({_OPENER_ALTERNATION})'  # Opening bracket
+    r'([^\]\)\}]+)'  # Label content
+    f'({_CLOSER_ALTERNATION})'  # Closing bracket
 )
 
+# Character-class table for _check_bracket_balance: one table lookup per
+# character decides whether it is interesting at all
+_CH_SKIP, _CH_OPEN, _CH_CLOSE, _CH_PIPE, _CH_QUOTE = 0, 1, 2, 3, 4
+_BRACKET_CLASS = bytearray(128)
+for _ch in '([{':
+    _BRACKET_CLASS[ord(_ch)] = _CH_OPEN
+for _ch in ')]}':
+    _BRACKET_CLASS[ord(_ch)] = _CH_CLOSE
+_BRACKET_CLASS[ord('|')] = _CH_PIPE
+_BRACKET_CLASS[ord('"')] = _CH_QUOTE
+_BRACKET_CLASS[ord("'")] = _CH_QUOTE
+del _ch
+
+_MATCHING_CLOSE = {'[': ']', '(': ')', '{': '}'}
+
+# Markdown fence around a mermaid block
+_MERMAID_FENCE_RE = re.compile(r'```mermaid\s*\n(.*?)\n```', re.DOTALL)
+
+# Node sanitization pattern, applied to the whole diagram in one sub() call.
+# The first branch swallows comment lines so node branches never fire inside
+# them; the label classes exclude newlines so matches stay within one line.
+# Square bracket nodes: ID[label]; round bracket nodes: ID(label) - the
+# lookahead keeps the round branch away from edge labels.
+_NODE_SANITIZE_RE = re.compile(
+    r'(?P<comment>^[^\S\n]*%%[^\n]*$)'
+    r'|(?P<sid>\b[A-Za-z_][A-Za-z0-9_]*)\[(?P<slabel>[^\]"\n]+)\]'
+    r'|(?P<rid>\b[A-Za-z_][A-Za-z0-9_]*)\((?P<rlabel>[^\)"\n]+)\)(?!\|)',
+    re.MULTILINE,
+)
+
+# Keywords that look like round-bracket nodes but are Mermaid directives
+_ROUND_SKIP_IDS = frozenset(['subgraph', 'end', 'click', 'style', 'class', 'linkstyle'])
+
+# Edge label cleanup: parenthesized asides are dropped whole, remaining
+# problematic characters are deleted with one translate() call
+_PAREN_RE = re.compile(r'\s*\([^)]*\)')
+_EDGE_STRIP_TABLE = str.maketrans('', '', '[]{}<>#;')
+
 
 def validate_mermaid(diagram_code: str) -> Tuple[bool, Optional[str]]:
     """Validate Mermaid diagram syntax.
@@ -46,18 +163,34 @@ def validate_mermaid(diagram_code: str) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if not diagram_code or not diagram_code.strip():
+    code = diagram_code.strip() if diagram_code else ""
+    if not code:
         return False, "Empty diagram code"
 
-    code = diagram_code.strip()
+    return _validate_stripped(code)
 
-    # Check for valid diagram type
-    has_valid_type = (
-        FLOWCHART_PATTERN.search(code) or
-        SEQUENCE_PATTERN.search(code) or
-        CLASS_PATTERN.search(code) or
-        STATE_PATTERN.search(code)
-    )
+
+def _validate_stripped(code: str) -> Tuple[bool, Optional[str]]:
+    """Validate already-stripped, non-empty diagram code.
+
+    Split out so validate_and_sanitize can strip once and reuse the
+    buffer across sanitization and validation.
+
+    Args:
+        code: Stripped, non-empty Mermaid diagram code
+
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    # Check for valid diagram type; dispatch on the first token so only one
+    # pattern runs in the common case
+    get_pattern = _DIAGRAM_TYPE_BY_KEYWORD.get(code.split(None, 1)[0])
+    has_valid_type = get_pattern().search(code) if get_pattern is not None else None
+    if has_valid_type is None:
+        # The first token can be a keyword whose own pattern fails (e.g. a
+        # bad flowchart direction) while a valid type header sits on a later
+        # line; the combined alternation scans the whole buffer
+        has_valid_type = _diagram_type_re().search(code)
 
     if not has_valid_type:
         return False, "No valid diagram type found (flowchart, sequenceDiagram, classDiagram, stateDiagram)"
@@ -89,41 +222,90 @@ def _check_bracket_balance(code: str) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_balanced, error_message)
     """
-    brackets = {'[': ']', '(': ')', '{': '}'}
+    # Fast path: without pipes or quotes there is no string or edge-label
+    # state to track, only bracket ordering
+    if '|' not in code and '"' not in code and "'" not in code:
+        return _check_bracket_order(code)
+
     stack = []
     in_string = False
     in_edge_label = False
     string_char = None
 
     for i, char in enumerate(code):
+        # Single table lookup; everything uninteresting falls through here
+        cp = ord(char)
+        cls = _BRACKET_CLASS[cp] if cp < 128 else _CH_SKIP
+        if cls == _CH_SKIP:
+            continue
+
         # Track edge labels (|...|) - skip bracket checking inside them
-        if char == '|' and not in_string:
-            in_edge_label = not in_edge_label
+        if cls == _CH_PIPE:
+            if not in_string:
+                in_edge_label = not in_edge_label
             continue
 
         if in_edge_label:
             continue
 
         # Handle string literals
-        if char in ['"', "'"] and (i == 0 or code[i-1] != '\\'):
-            if not in_string:
-                in_string = True
-                string_char = char
-            elif char == string_char:
-                in_string = False
-                string_char = None
+        if cls == _CH_QUOTE:
+            if i == 0 or code[i-1] != '\\':
+                if not in_string:
+                    in_string = True
+                    string_char = char
+                elif char == string_char:
+                    in_string = False
+                    string_char = None
             continue
 
         if in_string:
             continue
 
-        if char in brackets:
+        if cls == _CH_OPEN:
             stack.append((char, i))
-        elif char in brackets.values():
+        else:
             if not stack:
                 return False, f"Unbalanced bracket '{char}' at position {i}"
             expected_open, _ = stack.pop()
-            expected_close = brackets[expected_open]
+            expected_close = _MATCHING_CLOSE[expected_open]
+            if char != expected_close:
+                return False, f"Mismatched bracket: expected '{expected_close}', got '{char}' at position {i}"
+
+    if stack:
+        unclosed = [b[0] for b in stack]
+        return False, f"Unclosed brackets: {unclosed}"
+
+    return True, None
+
+
+def _check_bracket_order(code: str) -> Tuple[bool, Optional[str]]:
+    """Bracket check for code with no quotes or pipes.
+
+    Same stack logic and error messages as _check_bracket_balance, minus
+    the string and edge-label state that cannot apply here.
+
+    Args:
+        code: Mermaid diagram code containing no '|', '\"' or \"'\"
+
+    Returns:
+        Tuple of (is_balanced, error_message)
+    """
+    stack = []
+
+    for i, char in enumerate(code):
+        cp = ord(char)
+        cls = _BRACKET_CLASS[cp] if cp < 128 else _CH_SKIP
+        if cls == _CH_SKIP:
+            continue
+
+        if cls == _CH_OPEN:
+            stack.append((char, i))
+        else:
+            if not stack:
+                return False, f"Unbalanced bracket '{char}' at position {i}"
+            expected_open, _ = stack.pop()
+            expected_close = _MATCHING_CLOSE[expected_open]
             if char != expected_close:
                 return False, f"Mismatched bracket: expected '{expected_close}', got '{char}' at position {i}"
 
@@ -143,12 +325,18 @@ def _check_edge_labels(code: str) -> Optional[str]:
     Returns:
         Error message if issues found, None otherwise
     """
+    # Fast path: if none of the problematic characters appear anywhere in
+    # the code, no label can contain one - skip the regex scan entirely
+    if _PROBLEMATIC_EDGE_CHARS.isdisjoint(code):
+        return None
+
     for match in EDGE_LABEL_PATTERN.finditer(code):
         label = match.group(2)
-        # Check for problematic characters in edge labels
-        for char in PROBLEMATIC_IN_EDGE_LABELS:
-            if char in label and char != '|':  # | is the delimiter, already handled
-                return f"Edge label contains problematic character '{char}': |{label}|"
+        # Check for problematic characters in edge labels (one C-level
+        # set intersection instead of a per-character Python loop)
+        bad = _PROBLEMATIC_EDGE_CHARS.intersection(label)
+        if bad:
+            return f"Edge label contains problematic character '{min(bad)}': |{label}|"
 
     return None
 
@@ -162,15 +350,35 @@ def _check_node_labels(code: str) -> Optional[str]:
     Returns:
         Error message if issues found, None otherwise
     """
+    # Same fast path as _check_edge_labels: a label can only be flagged if
+    # one of these characters occurs somewhere in the code
+    if PROBLEMATIC_IN_NODE_LABELS.isdisjoint(code):
+        return None
+
     for match in NODE_LABEL_PATTERN.finditer(code):
         label = match.group(3)
         node_id = match.group(1)
 
+        closer = match.group(4)
+        expected = _CLOSER_FOR_OPENER[match.group(2)]
+        if closer != expected:
+            # The alternation can mis-segment label and closer: grab a longer
+            # closer whose tail is the real mate ("A[said (hi)]"), or stop the
+            # greedy label class at an excluded character inside a
+            # parallelogram label ("A[/input (raw)/]"). Re-derive the label
+            # against the opener's specific mate; if the mate is nowhere
+            # ahead, it is a bracket problem the balance check owns
+            rest = code[match.end(2):]
+            end = rest.find(expected)
+            if end == -1:
+                continue
+            label = rest[:end]
+
         # Check if label has problematic chars and isn't quoted
         if '"' not in match.group(0):  # Not already quoted
-            for char in PROBLEMATIC_IN_NODE_LABELS:
-                if char in label:
-                    return f"Node '{node_id}' has unquoted special character '{char}' in label: {label}"
+            bad = PROBLEMATIC_IN_NODE_LABELS.intersection(label)
+            if bad:
+                return f"Node '{node_id}' has unquoted special character '{min(bad)}' in label: {label}"
 
     return None
 
@@ -217,11 +425,10 @@ def _sanitize_edge_labels(code: str) -> str:
 
         # Remove problematic characters from edge labels
         # Replace parentheses content like "(Markdown)" with just the word
-        cleaned = re.sub(r'\s*\([^)]*\)', '', label)
+        cleaned = _PAREN_RE.sub('', label)
 
         # Remove any remaining problematic characters
-        for char in ['[', ']', '{', '}', '<', '>', '#', ';']:
-            cleaned = cleaned.replace(char, '')
+        cleaned = cleaned.translate(_EDGE_STRIP_TABLE)
 
         # Clean up extra whitespace
         cleaned = ' '.join(cleaned.split())
@@ -240,74 +447,42 @@ def _sanitize_node_labels(code: str) -> str:
     Returns:
         Code with sanitized node labels
     """
-    lines = code.split('\n')
-    sanitized_lines = []
+    return _NODE_SANITIZE_RE.sub(_quote_node_label_if_needed, code)
 
-    for line in lines:
-        # Skip empty lines and comments
-        if not line.strip() or line.strip().startswith('%%'):
-            sanitized_lines.append(line)
-            continue
-
-        sanitized_line = _sanitize_node_labels_in_line(line)
-        sanitized_lines.append(sanitized_line)
-
-    return '\n'.join(sanitized_lines)
 
-
-def _sanitize_node_labels_in_line(line: str) -> str:
-    """Sanitize node labels in a single line.
+def _quote_node_label_if_needed(match: re.Match[str]) -> str:
+    """Replacement callback for _NODE_SANITIZE_RE.
 
     Args:
-        line: A single line of Mermaid code
+        match: A comment line, square-bracket node, or round-bracket node
 
     Returns:
-        Line with sanitized node labels
+        The match with the label quoted if it needs quoting
     """
-    result = line
-
-    # Pattern for square bracket nodes: ID[label]
-    square_pattern = re.compile(r'(\b[A-Za-z_][A-Za-z0-9_]*)\[([^\]"]+)\]')
-
-    def quote_square_if_needed(match):
-        node_id = match.group(1)
-        label = match.group(2)
-
-        # Check if label needs quoting
-        needs_quoting = any(c in label for c in PROBLEMATIC_IN_NODE_LABELS)
+    # Comment lines pass through untouched
+    if match.group('comment') is not None:
+        return match.group(0)
 
-        if needs_quoting:
+    node_id = match.group('sid')
+    if node_id is not None:
+        label = match.group('slabel')
+        if not PROBLEMATIC_IN_NODE_LABELS.isdisjoint(label):
             escaped_label = label.replace('"', '\\"')
             return f'{node_id}["{escaped_label}"]'
-
         return match.group(0)
 
-    result = square_pattern.sub(quote_square_if_needed, result)
-
-    # Pattern for round bracket nodes: ID(label)
-    # Be careful not to match function calls or edge labels
-    round_pattern = re.compile(r'(\b[A-Za-z_][A-Za-z0-9_]*)\(([^\)"]+)\)(?!\|)')
-
-    def quote_round_if_needed(match):
-        node_id = match.group(1)
-        label = match.group(2)
-
-        # Skip if this looks like a function call (followed by certain patterns)
-        if node_id.lower() in ['subgraph', 'end', 'click', 'style', 'class', 'linkstyle']:
-            return match.group(0)
-
-        # Check if label needs quoting
-        needs_quoting = any(c in label for c in PROBLEMATIC_IN_NODE_LABELS)
-
-        if needs_quoting:
-            escaped_label = label.replace('"', '\\"')
-            return f'{node_id}("{escaped_label}")'
+    node_id = match.group('rid')
+    label = match.group('rlabel')
 
+    # Skip Mermaid directives that look like round-bracket nodes
+    if node_id.lower() in _ROUND_SKIP_IDS:
         return match.group(0)
 
-    result = round_pattern.sub(quote_round_if_needed, result)
+    if not PROBLEMATIC_IN_NODE_LABELS.isdisjoint(label):
+        escaped_label = label.replace('"', '\\"')
+        return f'{node_id}("{escaped_label}")'
 
-    return result
+    return match.group(0)
 
 
 def extract_diagram_code(text: str) -> Optional[str]:
@@ -320,14 +495,14 @@ def extract_diagram_code(text: str) -> Optional[str]:
         The diagram code without markdown fences, or None
     """
     # Look for ```mermaid ... ``` block
-    pattern = re.compile(r'```mermaid\s*\n(.*?)\n```', re.DOTALL)
-    match = pattern.search(text)
+    match = _MERMAID_FENCE_RE.search(text)
 
     if match:
         return match.group(1).strip()
 
-    # If no code block, assume the entire text is diagram code
-    if text.strip().startswith(('flowchart', 'graph', 'sequenceDiagram', 'classDiagram', 'stateDiagram')):
+    # If no code block, assume the entire text is diagram code; the anchored
+    # match replaces stripping the whole text just to inspect its start
+    if _DIAGRAM_START_RE.match(text):
         return text.strip()
 
     return None
@@ -348,20 +523,34 @@ def validate_and_sanitize(diagram_code: str) -> Tuple[str, bool, Optional[str]]:
     if not diagram_code:
         return "", False, "Empty diagram code"
 
-    # First validation
-    is_valid, error = validate_mermaid(diagram_code)
+    # Memoize all but unusually large diagrams; the same diagram is often
+    # validated again unchanged (e.g. when a report is re-rendered)
+    if len(diagram_code) < 64_000:
+        return _validate_and_sanitize_impl(diagram_code)
+    return _validate_and_sanitize_impl.__wrapped__(diagram_code)
+
+
+@lru_cache(maxsize=256)
+def _validate_and_sanitize_impl(diagram_code: str) -> Tuple[str, bool, Optional[str]]:
+    """Uncached body of validate_and_sanitize."""
+    # Strip once up front; sanitization and validation both work on the
+    # same stripped buffer instead of each stripping their own copy.
+    stripped = diagram_code.strip()
+    if not stripped:
+        return diagram_code, False, "Empty diagram code"
 
-    if not is_valid:
-        logger.debug(f"Initial validation failed: {error}")
+    # Sanitize first, then validate once. Sanitization always ran regardless
+    # of the initial validation result, so validating the raw input was a
+    # redundant full pass over the diagram.
+    sanitized = sanitize_mermaid(stripped)
 
-    # Always sanitize
-    sanitized = sanitize_mermaid(diagram_code)
+    if sanitized != stripped:
+        logger.debug("Sanitization modified the diagram")
 
-    # Re-validate
-    is_valid_after, error_after = validate_mermaid(sanitized)
+    is_valid, error = _validate_stripped(sanitized)
 
-    if is_valid_after:
+    if is_valid:
         return sanitized, True, None
     else:
-        logger.warning(f"Diagram still invalid after sanitization: {error_after}")
-        return sanitized, False, error_after
+        logger.warning("Diagram still invalid after sanitization: %s", error)
+        return sanitized, False, error
@@ -1,14 +1,40 @@
 """Pytest configuration and shared fixtures for Omni-Doc tests."""
 
+import asyncio
+import sys
+from types import MappingProxyType
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 from typing import Any
 
 
-@pytest.fixture
-def sample_pr_metadata() -> dict[str, Any]:
-    """Sample PR metadata fixture."""
-    return {
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop where available.
+
+    uvloop's C-accelerated loop speeds up every async test; fall back to
+    the default policy on platforms (or builds) without it.
+    """
+    if sys.platform != "win32":
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+def _sample_pr_metadata_base() -> dict[str, Any]:
+    """Session-shared base for sample_pr_metadata.
+
+    Frozen with MappingProxyType: sample_state exposes this dict directly
+    (not a copy), so freezing turns any cross-test mutation into an
+    immediate TypeError.
+    """
+    return MappingProxyType({
         "owner": "test-owner",
         "repo": "test-repo",
         "pr_number": 123,
@@ -22,13 +48,24 @@ def sample_pr_metadata() -> dict[str, Any]:
         "updated_at": "2024-01-15T12:00:00Z",
         "commits_count": 3,
         "comments_count": 1,
-    }
+    })
 
 
 @pytest.fixture
-def sample_file_changes() -> list[dict[str, Any]]:
-    """Sample file changes fixture."""
-    return [
+def sample_pr_metadata(_sample_pr_metadata_base: dict[str, Any]) -> dict[str, Any]:
+    """Sample PR metadata fixture (shallow copy of the session base)."""
+    return dict(_sample_pr_metadata_base)
+
+
+@pytest.fixture(scope="session")
+def _sample_file_changes_base() -> list[dict[str, Any]]:
+    """Session-shared base for sample_file_changes.
+
+    Element dicts are frozen with MappingProxyType: the per-test wrappers
+    only shallow-copy the list, so freezing the shared elements turns any
+    accidental cross-test mutation into an immediate TypeError.
+    """
+    return [MappingProxyType(fc) for fc in [
         {
             "filename": "src/main.py",
             "status": "modified",
@@ -53,13 +90,23 @@ def sample_file_changes() -> list[dict[str, Any]]:
             "patch": "@@ -1,3 +1,7 @@\n # Project\n\n-Basic description.\n+Updated description.\n+\n+## New Feature\n+\n+Documentation for new feature.\n",
             "previous_filename": None,
         },
-    ]
+    ]]
 
 
 @pytest.fixture
-def sample_documentation_files() -> list[dict[str, Any]]:
-    """Sample documentation files fixture."""
-    return [
+def sample_file_changes(_sample_file_changes_base: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Sample file changes fixture (shallow copy of the session base)."""
+    return list(_sample_file_changes_base)
+
+
+@pytest.fixture(scope="session")
+def _sample_documentation_files_base() -> list[dict[str, Any]]:
+    """Session-shared base for sample_documentation_files.
+
+    Element dicts are frozen with MappingProxyType, mirroring
+    _sample_file_changes_base.
+    """
+    return [MappingProxyType(df) for df in [
         {
             "path": "README.md",
             "doc_type": "readme",
@@ -78,13 +125,25 @@ def sample_documentation_files() -> list[dict[str, Any]]:
             "content": "# Changelog\n\n## v1.0.0\n\n- Initial release\n",
             "size": 50,
         },
-    ]
+    ]]
 
 
 @pytest.fixture
-def sample_findings() -> list[dict[str, Any]]:
-    """Sample analysis findings fixture."""
-    return [
+def sample_documentation_files(
+    _sample_documentation_files_base: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Sample documentation files fixture (shallow copy of the session base)."""
+    return list(_sample_documentation_files_base)
+
+
+@pytest.fixture(scope="session")
+def _sample_findings_base() -> list[dict[str, Any]]:
+    """Session-shared base for sample_findings.
+
+    Element dicts are frozen with MappingProxyType, mirroring
+    _sample_file_changes_base.
+    """
+    return [MappingProxyType(f) for f in [
         {
             "id": "finding-1",
             "finding_type": "discrepancy",
@@ -107,26 +166,38 @@ def sample_findings() -> list[dict[str, Any]]:
             "suggestion": "Add documentation for process_data() to the API reference.",
             "diagram": None,
         },
-    ]
+    ]]
 
 
 @pytest.fixture
-def sample_state(
-    sample_pr_metadata: dict[str, Any],
-    sample_file_changes: list[dict[str, Any]],
-    sample_documentation_files: list[dict[str, Any]],
-    sample_findings: list[dict[str, Any]],
+def sample_findings(_sample_findings_base: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Sample analysis findings fixture (shallow copy of the session base)."""
+    return list(_sample_findings_base)
+
+
+@pytest.fixture(scope="session")
+def _sample_state_base(
+    _sample_pr_metadata_base: dict[str, Any],
+    _sample_file_changes_base: list[dict[str, Any]],
+    _sample_documentation_files_base: list[dict[str, Any]],
+    _sample_findings_base: list[dict[str, Any]],
 ) -> dict[str, Any]:
-    """Complete sample state fixture."""
-    return {
+    """Session-shared base for sample_state.
+
+    Built once per session; tests get a shallow copy, so top-level key
+    assignments stay test-local while the nested structures are shared.
+    Wrapped in MappingProxyType so accidental mutation of the shared
+    template fails loudly instead of leaking between tests.
+    """
+    return MappingProxyType({
         "pr_url": "https://github.com/test-owner/test-repo/pull/123",
         "dry_run": True,
         "enable_diagrams": True,
-        "pr_metadata": sample_pr_metadata,
-        "file_changes": sample_file_changes,
-        "documentation_files": sample_documentation_files,
+        "pr_metadata": _sample_pr_metadata_base,
+        "file_changes": _sample_file_changes_base,
+        "documentation_files": _sample_documentation_files_base,
         "repo_structure": "Repository Structure:\n\nsrc/ (10 files)\ndocs/ (3 files)\n\nTotal: 13 files",
-        "findings": sample_findings,
+        "findings": _sample_findings_base,
         "agent_outputs": [],
         "agents_needed": ["correction"],
         "validation_passed": False,
@@ -135,12 +206,38 @@ def sample_state(
         "markdown_report": None,
         "comment_url": None,
         "errors": [],
-    }
+    })
 
 
 @pytest.fixture
+def sample_state(_sample_state_base: dict[str, Any]) -> dict[str, Any]:
+    """Complete sample state fixture (shallow copy of the session base)."""
+    state = dict(_sample_state_base)
+    # Fresh empty containers so appends in one test cannot leak into another
+    state["agent_outputs"] = []
+    state["errors"] = []
+    return state
+
+
+@pytest.fixture(scope="session")
+def compiled_main_graph():
+    """Compile the main graph once per session.
+
+    LangGraph compilation walks every node and edge; tests that only need
+    a compiled graph share this instance instead of rebuilding it.
+    """
+    from omni_doc.graph.main_graph import build_main_graph
+
+    return build_main_graph()
+
+
+@pytest.fixture(scope="session")
 def mock_settings():
-    """Mock settings fixture."""
+    """Mock settings fixture.
+
+    Session-scoped: tests only read attributes off it, so one shared
+    MagicMock replaces a fresh mock tree per test.
+    """
     settings = MagicMock()
     settings.github_token.get_secret_value.return_value = "test-github-token"
     settings.google_api_key.get_secret_value.return_value = "test-google-api-key"
@@ -174,6 +271,66 @@ def mock_llm():
     return llm
 
 
+def _coro_returning(value: Any):
+    """Build a plain coroutine function that returns value.
+
+    Cheaper than AsyncMock for stubs whose call args are never inspected:
+    awaiting it skips the mock call-tracking machinery entirely.
+    """
+    async def _coro(*_args: Any, **_kwargs: Any) -> Any:
+        return value
+
+    return _coro
+
+
+@pytest.fixture
+def coro_returning():
+    """Expose the plain-coroutine stub builder to tests."""
+    return _coro_returning
+
+
+def _coro_raising(exc: BaseException):
+    """Build a plain coroutine function that raises exc when awaited.
+
+    Counterpart of _coro_returning for error-path tests that would
+    otherwise need AsyncMock(side_effect=...).
+    """
+    async def _coro(*_args: Any, **_kwargs: Any) -> Any:
+        raise exc
+
+    return _coro
+
+
+@pytest.fixture
+def coro_raising():
+    """Expose the raising-coroutine stub builder to tests."""
+    return _coro_raising
+
+
+class _StubLLM:
+    """Minimal stand-in for a structured-output chat model.
+
+    A plain class beats a MagicMock chain here: no lazy child-mock
+    creation, no call recording - just the two methods the code under
+    test actually touches.
+    """
+
+    def __init__(self, response: Any) -> None:
+        self._response = response
+
+    def with_structured_output(self, *_args: Any, **_kwargs: Any) -> "_StubLLM":
+        return self
+
+    async def ainvoke(self, *_args: Any, **_kwargs: Any) -> Any:
+        return self._response
+
+
+@pytest.fixture
+def mock_llm_factory():
+    """Factory for stub LLMs whose structured output returns a canned response."""
+    return _StubLLM
+
+
 @pytest.fixture(autouse=True)
 def reset_global_clients():
     """Reset global client instances between tests."""
@@ -1,32 +1,39 @@
 """Integration tests for the LangGraph workflow."""
 
 import pytest
+from contextlib import ExitStack
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
-from typing import Any
+
+from omni_doc.graph.routing import route_after_discovery, route_agents, should_retry_analysis
+from omni_doc.models.output_models import AuditorResponse, CriticResponse
+from omni_doc.models.state import create_initial_state
 
 
 class TestGraphConstruction:
     """Tests for graph construction."""
 
-    def test_build_main_graph_compiles(self):
+    def test_build_main_graph_compiles(self, compiled_main_graph):
         """Test that the main graph compiles successfully."""
-        from omni_doc.graph.main_graph import build_main_graph
-
-        graph = build_main_graph()
-
         # Graph should compile without errors
-        assert graph is not None
+        assert compiled_main_graph is not None
 
-    def test_graph_has_expected_nodes(self):
+    def test_graph_has_expected_nodes(self, compiled_main_graph):
         """Test that the graph has all expected nodes."""
-        from omni_doc.graph.main_graph import build_main_graph
-
-        graph = build_main_graph()
-
-        # Get the graph structure - nodes are in the graph's nodes dict
-        # Note: The compiled graph may have different structure access patterns
-        # This test verifies the graph is properly constructed
-        assert graph is not None
+        nodes = set(compiled_main_graph.get_graph().nodes)
+
+        assert nodes >= {
+            "extractor",
+            "discovery",
+            "repo_scanner",
+            "auditor",
+            "correction_agent",
+            "technical_writer_agent",
+            "visual_architect_agent",
+            "critic",
+            "aggregator",
+            "post_comment",
+        }
 
 
 class TestRoutingFunctions:
@@ -34,56 +41,36 @@ class TestRoutingFunctions:
 
     def test_route_after_discovery_to_scanner(self, sample_state):
         """Test routing to repo_scanner after discovery."""
-        from omni_doc.graph.routing import route_after_discovery
-
         # Discovery should route to scanner in MVP
         result = route_after_discovery(sample_state)
 
         assert result == "repo_scanner"
 
-    def test_should_retry_analysis_true(self, sample_state):
-        """Test retry decision when validation fails."""
-        from omni_doc.graph.routing import should_retry_analysis
-
-        sample_state["validation_passed"] = False
-        sample_state["retry_count"] = 1
-
-        with patch("omni_doc.graph.routing.get_settings") as mock_settings:
-            mock_settings.return_value.max_retries = 3
-            result = should_retry_analysis(sample_state)
-
-        assert result == "auditor"
-
-    def test_should_retry_analysis_false_passed(self, sample_state):
-        """Test no retry when validation passes."""
-        from omni_doc.graph.routing import should_retry_analysis
-
-        sample_state["validation_passed"] = True
-        sample_state["retry_count"] = 1
-
-        with patch("omni_doc.graph.routing.get_settings") as mock_settings:
-            mock_settings.return_value.max_retries = 3
-            result = should_retry_analysis(sample_state)
-
-        assert result == "aggregator"
-
-    def test_should_retry_analysis_false_max_retries(self, sample_state):
-        """Test no retry when max retries reached."""
-        from omni_doc.graph.routing import should_retry_analysis
-
-        sample_state["validation_passed"] = False
-        sample_state["retry_count"] = 5
-
-        with patch("omni_doc.graph.routing.get_settings") as mock_settings:
-            mock_settings.return_value.max_retries = 3
-            result = should_retry_analysis(sample_state)
-
-        assert result == "aggregator"
+    @pytest.mark.parametrize(
+        "validation_passed,retry_count,expected",
+        [
+            (False, 1, "auditor"),     # validation failed, retries left
+            (True, 1, "aggregator"),   # validation passed
+            (False, 5, "aggregator"),  # max retries reached
+        ],
+    )
+    def test_should_retry_analysis(
+        self, sample_state, monkeypatch, validation_passed, retry_count, expected
+    ):
+        """Test the retry decision across validation/retry combinations."""
+        sample_state["validation_passed"] = validation_passed
+        sample_state["retry_count"] = retry_count
+
+        # monkeypatch swaps the attribute directly - much lighter than the
+        # full mock.patch machinery for a value that is only read; a plain
+        # SimpleNamespace beats MagicMock for a stub with no call tracking
+        fake_settings = SimpleNamespace(max_retries=3)
+        monkeypatch.setattr("omni_doc.graph.routing.get_settings", lambda: fake_settings)
+
+        assert should_retry_analysis(sample_state) == expected
 
     def test_route_agents_with_agents_needed(self, sample_state):
         """Test agent routing when agents are needed."""
-        from omni_doc.graph.routing import route_agents
-
         sample_state["agents_needed"] = ["correction", "technical_writer"]
 
         result = route_agents(sample_state)
@@ -93,8 +80,6 @@ class TestRoutingFunctions:
 
     def test_route_agents_no_agents(self, sample_state):
         """Test routing to critic when no agents needed."""
-        from omni_doc.graph.routing import route_agents
-
         sample_state["agents_needed"] = []
 
         result = route_agents(sample_state)
@@ -106,18 +91,17 @@ class TestGraphExecution:
     """Tests for full graph execution with mocked services."""
 
     @pytest.mark.asyncio
-    async def test_graph_execution_minimal(self, sample_state, mock_settings):
+    async def test_graph_execution_minimal(
+        self, compiled_main_graph, sample_state, mock_settings, coro_returning, monkeypatch
+    ):
         """Test minimal graph execution with all mocked services."""
-        from omni_doc.graph.main_graph import build_main_graph
-        from omni_doc.models.state import create_initial_state
-        from omni_doc.models.output_models import AuditorResponse, CriticResponse
-
-        # Mock all external services
+        # Mock all external services; plain coroutines stand in for async
+        # methods whose call args this test never inspects
         mock_fetcher = AsyncMock()
-        mock_fetcher.fetch_pr_details = AsyncMock(
-            return_value=(sample_state["pr_metadata"], sample_state["file_changes"])
+        mock_fetcher.fetch_pr_details = coro_returning(
+            (sample_state["pr_metadata"], sample_state["file_changes"])
         )
-        mock_fetcher.get_repo_tree = AsyncMock(return_value=MagicMock(tree=[], truncated=False))
+        mock_fetcher.get_repo_tree = coro_returning(MagicMock(tree=[], truncated=False))
 
         mock_auditor_response = AuditorResponse(
             summary="No issues",
@@ -140,12 +124,12 @@ class TestGraphExecution:
         )
 
         mock_commenter = AsyncMock()
-        mock_commenter.update_or_create_comment = AsyncMock(
-            return_value="https://github.com/test/test/pull/1#comment"
+        mock_commenter.update_or_create_comment = coro_returning(
+            "https://github.com/test/test/pull/1#comment"
         )
 
-        # Build and run graph
-        graph = build_main_graph()
+        # Use the session-compiled graph
+        graph = compiled_main_graph
 
         initial_state = create_initial_state(
             pr_url="https://github.com/test-owner/test-repo/pull/123",
@@ -153,17 +137,22 @@ class TestGraphExecution:
             enable_diagrams=False,
         )
 
-        # Apply mocks using context managers
-        with patch("omni_doc.nodes.extractor.PRFetcher", return_value=mock_fetcher):
-            with patch("omni_doc.nodes.repo_scanner.PRFetcher", return_value=mock_fetcher):
-                with patch("omni_doc.nodes.auditor.get_settings", return_value=mock_settings):
-                    with patch("omni_doc.nodes.auditor.ChatGoogleGenerativeAI", return_value=mock_llm):
-                        with patch("omni_doc.nodes.critic.get_settings", return_value=mock_settings):
-                            with patch("omni_doc.nodes.critic.ChatGoogleGenerativeAI", return_value=mock_llm):
-                                with patch("omni_doc.nodes.aggregator.PRCommenter", return_value=mock_commenter):
-                                    # This is a complex test that would require more mocking
-                                    # For now, just verify the graph can be built
-                                    assert graph is not None
+        # Apply all mocks through one ExitStack instead of a nested pyramid
+        with ExitStack() as stack:
+            stack.enter_context(
+                patch("omni_doc.nodes.extractor.get_pr_fetcher", AsyncMock(return_value=mock_fetcher))
+            )
+            stack.enter_context(
+                patch("omni_doc.nodes.repo_scanner.get_pr_fetcher", AsyncMock(return_value=mock_fetcher))
+            )
+            monkeypatch.setattr("omni_doc.nodes.auditor.get_settings", lambda: mock_settings)
+            stack.enter_context(patch("langchain_google_genai.ChatGoogleGenerativeAI", return_value=mock_llm))
+            monkeypatch.setattr("omni_doc.nodes.critic.get_settings", lambda: mock_settings)
+            stack.enter_context(patch("omni_doc.nodes.aggregator.PRCommenter", return_value=mock_commenter))
+
+            # This is a complex test that would require more mocking
+            # For now, just verify the graph can be built
+            assert graph is not None
 
 
 class TestStateCreation:
@@ -171,8 +160,6 @@ class TestStateCreation:
 
     def test_create_initial_state(self):
         """Test creating initial state."""
-        from omni_doc.models.state import create_initial_state
-
         state = create_initial_state(
             pr_url="https://github.com/owner/repo/pull/123",
             dry_run=True,
@@ -188,8 +175,6 @@ class TestStateCreation:
 
     def test_create_initial_state_defaults(self):
         """Test initial state default values."""
-        from omni_doc.models.state import create_initial_state
-
         state = create_initial_state(
             pr_url="https://github.com/owner/repo/pull/123",
         )
@@ -204,6 +189,6 @@ class TestRunAnalysis:
     @pytest.mark.asyncio
     async def test_run_analysis_function_exists(self):
         """Test that run_analysis function can be imported."""
-        from omni_doc.graph.main_graph import run_analysis
+        from omni_doc.graph.runner import run_analysis
 
         assert callable(run_analysis)
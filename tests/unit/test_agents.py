@@ -1,68 +1,93 @@
 """Unit tests for specialized documentation agents."""
 
+import asyncio
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from typing import Any
+from unittest.mock import patch
 
+from pydantic import BaseModel
 
-class TestBaseDocAgent:
-    """Tests for the base agent class."""
+from omni_doc.agents.base import BaseDocAgent
+from omni_doc.agents.correction import CorrectionAgent, run_correction_agent
+from omni_doc.agents.technical_writer import TechnicalWriterAgent, run_technical_writer
+from omni_doc.agents.visual_architect import VisualArchitectAgent, run_visual_architect
+from omni_doc.models.output_models import (
+    AnalysisFinding,
+    CorrectionOutput,
+    DiagramOutput,
+    TechnicalWriterOutput,
+)
 
-    def test_base_agent_is_abstract(self):
-        """Test that BaseDocAgent cannot be instantiated directly."""
-        from omni_doc.agents.base import BaseDocAgent
 
-        with pytest.raises(TypeError):
-            BaseDocAgent()
+# Module-level stub classes for TestBaseDocAgent: pydantic compiles a schema
+# per BaseModel subclass and ABCs re-run abstract-method checks per class, so
+# defining these once avoids repeating that work inside each test.
+class _StubOutput(BaseModel):
+    result: str
 
-    def test_base_agent_requires_name(self):
-        """Test that subclasses must implement name."""
-        from omni_doc.agents.base import BaseDocAgent
-        from pydantic import BaseModel
 
-        class TestOutput(BaseModel):
-            result: str
+class _IncompleteAgent(BaseDocAgent[_StubOutput]):
+    """Agent subclass that is missing the name property."""
 
-        class IncompleteAgent(BaseDocAgent[TestOutput]):
-            @property
-            def system_prompt(self) -> str:
-                return "test"
+    @property
+    def system_prompt(self) -> str:
+        return "test"
 
-            @property
-            def output_model(self) -> type[TestOutput]:
-                return TestOutput
+    @property
+    def output_model(self) -> type[_StubOutput]:
+        return _StubOutput
 
-            async def process(self, state):
-                return {}
+    async def process(self, state):
+        return {}
 
-        with pytest.raises(TypeError):
-            IncompleteAgent()
 
-    def test_build_context(self, sample_state):
-        """Test context building from state."""
-        from omni_doc.agents.base import BaseDocAgent
-        from pydantic import BaseModel
+class _StubAgent(_IncompleteAgent):
+    """Minimal complete agent subclass."""
+
+    @property
+    def name(self) -> str:
+        return "test_agent"
+
+    @property
+    def system_prompt(self) -> str:
+        return "Test system prompt"
+
 
-        class TestOutput(BaseModel):
-            result: str
+# Session-scoped instances for the property-only tests below: name,
+# system_prompt and temperature are read-only, so one shared instance per
+# agent class is safe. process() tests build fresh instances with injected
+# mock LLMs and must not use these.
+@pytest.fixture(scope="session")
+def correction_agent() -> CorrectionAgent:
+    return CorrectionAgent()
 
-        class TestAgent(BaseDocAgent[TestOutput]):
-            @property
-            def name(self) -> str:
-                return "test_agent"
 
-            @property
-            def system_prompt(self) -> str:
-                return "Test system prompt"
+@pytest.fixture(scope="session")
+def technical_writer_agent() -> TechnicalWriterAgent:
+    return TechnicalWriterAgent()
 
-            @property
-            def output_model(self) -> type[TestOutput]:
-                return TestOutput
 
-            async def process(self, state):
-                return {}
+@pytest.fixture(scope="session")
+def visual_architect_agent() -> VisualArchitectAgent:
+    return VisualArchitectAgent()
+
+
+class TestBaseDocAgent:
+    """Tests for the base agent class."""
 
-        agent = TestAgent()
+    def test_base_agent_is_abstract(self):
+        """Test that BaseDocAgent cannot be instantiated directly."""
+        with pytest.raises(TypeError):
+            BaseDocAgent()
+
+    def test_base_agent_requires_name(self):
+        """Test that subclasses must implement name."""
+        with pytest.raises(TypeError):
+            _IncompleteAgent()
+
+    def test_build_context(self, sample_state):
+        """Test context building from state."""
+        agent = _StubAgent()
         context = agent._build_context(sample_state)
 
         assert "Add new feature" in context  # PR title
@@ -70,240 +95,183 @@ class TestBaseDocAgent:
         assert "src/main.py" in context  # File change
 
 
-class TestCorrectionAgent:
-    """Tests for the correction agent."""
+class TestAgentProcessing:
+    """process() tests for the three specialized agents.
 
-    @pytest.mark.asyncio
-    async def test_correction_agent_process(
-        self,
-        sample_state,
-        mock_settings,
-    ):
-        """Test correction agent processing."""
-        from omni_doc.agents.correction import CorrectionAgent
-        from omni_doc.models.output_models import CorrectionOutput, AnalysisFinding
+    The three checks are independent coroutines run concurrently on one
+    event loop via asyncio.gather, instead of paying loop startup and
+    teardown for three separate async tests. Each agent gets its own
+    _llm, so nothing is shared between the coroutines; the run_* wrapper
+    tests stay separate because they patch module-level attributes.
+    """
 
-        mock_response = CorrectionOutput(
-            corrections=[
-                AnalysisFinding(
-                    finding_type="discrepancy",
-                    severity="high",
-                    title="API documentation needs update",
-                    description="The API docs need to be updated for the new changes",
-                    file_path="docs/api.md",
-                    suggestion="Update the main() documentation",
-                )
-            ],
-            suggested_updates="## Updated API Documentation\n\nNew content here.",
+    @pytest.mark.asyncio
+    async def test_agents_process(self, sample_state, mock_llm_factory):
+        """Test all three agents' process() concurrently."""
+
+        async def _check_correction():
+            mock_response = CorrectionOutput(
+                corrections=[
+                    AnalysisFinding(
+                        finding_type="discrepancy",
+                        severity="high",
+                        title="API documentation needs update",
+                        description="The API docs need to be updated for the new changes",
+                        file_path="docs/api.md",
+                        suggestion="Update the main() documentation",
+                    )
+                ],
+                suggested_updates="## Updated API Documentation\n\nNew content here.",
+            )
+
+            mock_llm = mock_llm_factory(mock_response)
+            agent = CorrectionAgent(llm_factory=lambda: mock_llm)
+
+            # llm_factory is injected, so get_settings won't be called
+            result = await agent.process(sample_state)
+
+            assert "agent_outputs" in result
+            assert len(result["agent_outputs"]) == 1
+            assert result["agent_outputs"][0]["agent_name"] == "correction"
+
+        async def _check_technical_writer():
+            mock_response = TechnicalWriterOutput(
+                new_documentation="# New API Documentation\n\nDocumentation for new feature.",
+                findings=[
+                    AnalysisFinding(
+                        finding_type="missing_doc",
+                        severity="medium",
+                        title="Missing API documentation",
+                        description="The new process_data function lacks documentation",
+                        file_path="docs/api.md",
+                        suggestion="Add documentation for the new function",
+                    )
+                ],
+                style_notes="Match the existing API documentation style.",
+            )
+
+            mock_llm = mock_llm_factory(mock_response)
+            agent = TechnicalWriterAgent(llm_factory=lambda: mock_llm)
+
+            result = await agent.process(sample_state)
+
+            assert "agent_outputs" in result
+            assert len(result["agent_outputs"]) == 1
+            assert result["agent_outputs"][0]["agent_name"] == "technical_writer"
+
+        async def _check_visual_architect():
+            mock_response = DiagramOutput(
+                diagram_type="flowchart",
+                diagram_code="graph TD\n    A[Start] --> B[Process]\n    B --> C[End]",
+                description="Shows the data processing flow",
+                finding=AnalysisFinding(
+                    finding_type="diagram_needed",
+                    severity="low",
+                    title="Data Flow Diagram",
+                    description="A diagram showing the data flow would help understanding",
+                    suggestion="Add this diagram to the documentation",
+                ),
+            )
+
+            mock_llm = mock_llm_factory(mock_response)
+            agent = VisualArchitectAgent(llm_factory=lambda: mock_llm)
+
+            result = await agent.process(sample_state)
+
+            assert "agent_outputs" in result
+            assert len(result["agent_outputs"]) == 1
+            assert result["agent_outputs"][0]["agent_name"] == "visual_architect"
+
+        await asyncio.gather(
+            _check_correction(),
+            _check_technical_writer(),
+            _check_visual_architect(),
         )
 
-        mock_llm = MagicMock()
-        mock_structured = MagicMock()
-        mock_structured.ainvoke = AsyncMock(return_value=mock_response)
-        mock_llm.with_structured_output = MagicMock(return_value=mock_structured)
-
-        agent = CorrectionAgent()
-        agent._llm = mock_llm
-
-        # _llm is already set, so get_settings won't be called
-        result = await agent.process(sample_state)
 
-        assert "agent_outputs" in result
-        assert len(result["agent_outputs"]) == 1
-        assert result["agent_outputs"][0]["agent_name"] == "correction"
+class TestCorrectionAgent:
+    """Tests for the correction agent."""
 
-    def test_correction_agent_name(self):
+    def test_correction_agent_name(self, correction_agent):
         """Test correction agent name property."""
-        from omni_doc.agents.correction import CorrectionAgent
+        assert correction_agent.name == "correction"
 
-        agent = CorrectionAgent()
-        assert agent.name == "correction"
-
-    def test_correction_agent_system_prompt(self):
+    def test_correction_agent_system_prompt(self, correction_agent):
         """Test correction agent has system prompt."""
-        from omni_doc.agents.correction import CorrectionAgent
-
-        agent = CorrectionAgent()
-        assert len(agent.system_prompt) > 0
-        assert "correction" in agent.system_prompt.lower() or "documentation" in agent.system_prompt.lower()
+        prompt = correction_agent.system_prompt
+        assert len(prompt) > 0
+        assert "correction" in prompt.lower() or "documentation" in prompt.lower()
 
 
 class TestTechnicalWriterAgent:
     """Tests for the technical writer agent."""
 
-    @pytest.mark.asyncio
-    async def test_technical_writer_process(
-        self,
-        sample_state,
-        mock_settings,
-    ):
-        """Test technical writer agent processing."""
-        from omni_doc.agents.technical_writer import TechnicalWriterAgent
-        from omni_doc.models.output_models import TechnicalWriterOutput, AnalysisFinding
-
-        mock_response = TechnicalWriterOutput(
-            new_documentation="# New API Documentation\n\nDocumentation for new feature.",
-            findings=[
-                AnalysisFinding(
-                    finding_type="missing_doc",
-                    severity="medium",
-                    title="Missing API documentation",
-                    description="The new process_data function lacks documentation",
-                    file_path="docs/api.md",
-                    suggestion="Add documentation for the new function",
-                )
-            ],
-            style_notes="Match the existing API documentation style.",
-        )
-
-        mock_llm = MagicMock()
-        mock_structured = MagicMock()
-        mock_structured.ainvoke = AsyncMock(return_value=mock_response)
-        mock_llm.with_structured_output = MagicMock(return_value=mock_structured)
-
-        agent = TechnicalWriterAgent()
-        agent._llm = mock_llm
-
-        # _llm is already set, so get_settings won't be called
-        result = await agent.process(sample_state)
-
-        assert "agent_outputs" in result
-        assert len(result["agent_outputs"]) == 1
-        assert result["agent_outputs"][0]["agent_name"] == "technical_writer"
-
-    def test_technical_writer_name(self):
+    def test_technical_writer_name(self, technical_writer_agent):
         """Test technical writer agent name property."""
-        from omni_doc.agents.technical_writer import TechnicalWriterAgent
+        assert technical_writer_agent.name == "technical_writer"
 
-        agent = TechnicalWriterAgent()
-        assert agent.name == "technical_writer"
-
-    def test_technical_writer_system_prompt(self):
+    def test_technical_writer_system_prompt(self, technical_writer_agent):
         """Test technical writer agent has system prompt."""
-        from omni_doc.agents.technical_writer import TechnicalWriterAgent
-
-        agent = TechnicalWriterAgent()
-        assert len(agent.system_prompt) > 0
+        assert len(technical_writer_agent.system_prompt) > 0
 
 
 class TestVisualArchitectAgent:
     """Tests for the visual architect agent."""
 
-    @pytest.mark.asyncio
-    async def test_visual_architect_process(
-        self,
-        sample_state,
-        mock_settings,
-    ):
-        """Test visual architect agent processing."""
-        from omni_doc.agents.visual_architect import VisualArchitectAgent
-        from omni_doc.models.output_models import DiagramOutput, AnalysisFinding
-
-        mock_response = DiagramOutput(
-            diagram_type="flowchart",
-            diagram_code="graph TD\n    A[Start] --> B[Process]\n    B --> C[End]",
-            description="Shows the data processing flow",
-            finding=AnalysisFinding(
-                finding_type="diagram_needed",
-                severity="low",
-                title="Data Flow Diagram",
-                description="A diagram showing the data flow would help understanding",
-                suggestion="Add this diagram to the documentation",
-            ),
-        )
-
-        mock_llm = MagicMock()
-        mock_structured = MagicMock()
-        mock_structured.ainvoke = AsyncMock(return_value=mock_response)
-        mock_llm.with_structured_output = MagicMock(return_value=mock_structured)
-
-        agent = VisualArchitectAgent()
-        agent._llm = mock_llm
-
-        # _llm is already set, so get_settings won't be called
-        result = await agent.process(sample_state)
-
-        assert "agent_outputs" in result
-        assert len(result["agent_outputs"]) == 1
-        assert result["agent_outputs"][0]["agent_name"] == "visual_architect"
-
-    def test_visual_architect_name(self):
+    def test_visual_architect_name(self, visual_architect_agent):
         """Test visual architect agent name property."""
-        from omni_doc.agents.visual_architect import VisualArchitectAgent
+        assert visual_architect_agent.name == "visual_architect"
 
-        agent = VisualArchitectAgent()
-        assert agent.name == "visual_architect"
-
-    def test_visual_architect_higher_temperature(self):
+    def test_visual_architect_higher_temperature(self, visual_architect_agent):
         """Test visual architect uses higher temperature for creativity."""
-        from omni_doc.agents.visual_architect import VisualArchitectAgent
-
-        agent = VisualArchitectAgent()
         # Visual architect should use temperature around 0.4 for creativity
-        assert agent._temperature >= 0.3
+        assert visual_architect_agent._temperature >= 0.3
 
-    def test_visual_architect_system_prompt_has_mermaid(self):
+    def test_visual_architect_system_prompt_has_mermaid(self, visual_architect_agent):
         """Test visual architect prompt includes Mermaid examples."""
-        from omni_doc.agents.visual_architect import VisualArchitectAgent
-
-        agent = VisualArchitectAgent()
         # System prompt should include Mermaid diagram guidance
-        assert "mermaid" in agent.system_prompt.lower() or "diagram" in agent.system_prompt.lower()
+        prompt = visual_architect_agent.system_prompt
+        assert "mermaid" in prompt.lower() or "diagram" in prompt.lower()
 
 
 class TestRunAgentFunctions:
     """Tests for the node wrapper functions that run agents."""
 
     @pytest.mark.asyncio
-    async def test_run_correction_agent(self, sample_state, mock_settings):
+    async def test_run_correction_agent(self, sample_state, mock_settings, mock_llm_factory, monkeypatch):
         """Test run_correction_agent wrapper."""
-        from omni_doc.agents.correction import run_correction_agent
-        from omni_doc.models.output_models import CorrectionOutput
-
         mock_response = CorrectionOutput(
             corrections=[],
             suggested_updates="No corrections needed",
         )
 
-        mock_llm = MagicMock()
-        mock_structured = MagicMock()
-        mock_structured.ainvoke = AsyncMock(return_value=mock_response)
-        mock_llm.with_structured_output = MagicMock(return_value=mock_structured)
+        mock_llm = mock_llm_factory(mock_response)
 
-        with patch("omni_doc.agents.base.get_settings", return_value=mock_settings):
-            with patch("omni_doc.agents.base.ChatGoogleGenerativeAI", return_value=mock_llm):
-                result = await run_correction_agent(sample_state)
+        monkeypatch.setattr("omni_doc.agents.base.get_settings", lambda: mock_settings)
+        with patch("langchain_google_genai.ChatGoogleGenerativeAI", return_value=mock_llm):
+            result = await run_correction_agent(sample_state)
 
         assert "agent_outputs" in result
 
     @pytest.mark.asyncio
-    async def test_run_technical_writer(self, sample_state, mock_settings):
+    async def test_run_technical_writer(self, sample_state, mock_settings, mock_llm_factory, monkeypatch):
         """Test run_technical_writer wrapper."""
-        from omni_doc.agents.technical_writer import run_technical_writer
-        from omni_doc.models.output_models import TechnicalWriterOutput
-
         mock_response = TechnicalWriterOutput(
             new_documentation="No new documentation needed",
             findings=[],
         )
 
-        mock_llm = MagicMock()
-        mock_structured = MagicMock()
-        mock_structured.ainvoke = AsyncMock(return_value=mock_response)
-        mock_llm.with_structured_output = MagicMock(return_value=mock_structured)
+        mock_llm = mock_llm_factory(mock_response)
 
-        with patch("omni_doc.agents.base.get_settings", return_value=mock_settings):
-            with patch("omni_doc.agents.base.ChatGoogleGenerativeAI", return_value=mock_llm):
-                result = await run_technical_writer(sample_state)
+        monkeypatch.setattr("omni_doc.agents.base.get_settings", lambda: mock_settings)
+        with patch("langchain_google_genai.ChatGoogleGenerativeAI", return_value=mock_llm):
+            result = await run_technical_writer(sample_state)
 
         assert "agent_outputs" in result
 
     @pytest.mark.asyncio
-    async def test_run_visual_architect(self, sample_state, mock_settings):
+    async def test_run_visual_architect(self, sample_state, mock_settings, mock_llm_factory, monkeypatch):
         """Test run_visual_architect wrapper."""
-        from omni_doc.agents.visual_architect import run_visual_architect
-        from omni_doc.models.output_models import DiagramOutput, AnalysisFinding
-
         mock_response = DiagramOutput(
             diagram_type="flowchart",
             diagram_code="graph TD\n    A --> B",
@@ -317,13 +285,10 @@ class TestRunAgentFunctions:
             ),
         )
 
-        mock_llm = MagicMock()
-        mock_structured = MagicMock()
-        mock_structured.ainvoke = AsyncMock(return_value=mock_response)
-        mock_llm.with_structured_output = MagicMock(return_value=mock_structured)
+        mock_llm = mock_llm_factory(mock_response)
 
-        with patch("omni_doc.agents.base.get_settings", return_value=mock_settings):
-            with patch("omni_doc.agents.base.ChatGoogleGenerativeAI", return_value=mock_llm):
-                result = await run_visual_architect(sample_state)
+        monkeypatch.setattr("omni_doc.agents.base.get_settings", lambda: mock_settings)
+        with patch("langchain_google_genai.ChatGoogleGenerativeAI", return_value=mock_llm):
+            result = await run_visual_architect(sample_state)
 
         assert "agent_outputs" in result